@@ -4,32 +4,767 @@ Supports GET, POST, PUT, DELETE operations with JSON and XML payloads
 """
 
 import requests
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
 import json
 import xml.etree.ElementTree as ET
 import xmltodict
 from robot.api.deco import keyword
 from robot.libraries.BuiltIn import BuiltIn
-from datetime import datetime
+try:
+    from ._logging import LoggingPolicy, LogSamplingListener
+except ImportError:
+    from _logging import LoggingPolicy, LogSamplingListener
+try:
+    from ._serialization import dump_json
+except ImportError:
+    from _serialization import dump_json
+import base64
+import codecs
+import copy
+from collections import OrderedDict
+import csv
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import functools
+import gzip
+import hashlib
+import inspect
+import itertools
+import math
 import os
+import re
+import threading
+import time
+from urllib.parse import parse_qsl, urlparse
 
+# Upper bounds (milliseconds) of the load test latency histogram buckets
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
 
-class APIKeywords:
+# Content-Type sent for each payload type unless the headers already set one
+CONTENT_TYPES = {'json': 'application/json', 'xml': 'application/xml'}
+
+# Request phases recorded by the timing instrumentation, in order
+METRIC_PHASES = ('connect', 'tls', 'ttfb', 'download', 'parse', 'total')
+METRIC_FIELDS = ('timestamp', 'method', 'endpoint', 'url', 'status', 'request_bytes',
+                 'response_bytes') + METRIC_PHASES
+_ID_SEGMENT = re.compile(r'/\d+(?=/|$)')
+
+# Bytes read per chunk when walking a streamed response body
+STREAM_CHUNK_SIZE = 64 * 1024
+_SCALAR_END = re.compile(r'[,\]\s]')
+
+
+def _endpoint_shape(endpoint):
+    """Collapse numeric path segments so /table/film/1001 groups as /table/film/{id}"""
+    return _ID_SEGMENT.sub('/{id}', urlparse(endpoint).path or endpoint)
+
+
+def _iter_json_array(chunks):
+    """Incrementally decode a top-level JSON array from an iterable of byte chunks
+
+    Only the current item and the unparsed remainder of the latest chunk are kept
+    in memory, so arbitrarily long arrays are walked in constant memory.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    chunks = iter(chunks)
+    buffer = ''
+    pos = 0
+    eof = False
+    # What may come next: '[' (start), an item or ']' (first), an item (item),
+    # ',' or ']' (separator), only whitespace (end)
+    expect = 'start'
+
+    def fill():
+        nonlocal buffer, pos, eof
+        for chunk in chunks:
+            if chunk:
+                buffer = buffer[pos:] + text_decoder.decode(chunk)
+                pos = 0
+                return
+        buffer = buffer[pos:] + text_decoder.decode(b'', final=True)
+        pos = 0
+        eof = True
+
+    while True:
+        while pos < len(buffer) and buffer[pos] in ' \t\r\n':
+            pos += 1
+        if pos >= len(buffer):
+            if eof:
+                if expect == 'end':
+                    return
+                raise ValueError("Unexpected end of JSON array")
+            fill()
+            continue
+
+        char = buffer[pos]
+        if expect == 'start':
+            if char != '[':
+                raise ValueError("Response body is not a JSON array")
+            expect = 'first'
+            pos += 1
+            continue
+        if expect == 'end':
+            raise ValueError(f"Unexpected data after the JSON array at character {pos}")
+        if expect == 'separator':
+            if char == ',':
+                expect = 'item'
+            elif char == ']':
+                expect = 'end'
+            else:
+                raise ValueError(f"Expected ',' or ']' in JSON array, got {char!r}")
+            pos += 1
+            continue
+        if char == ']' and expect == 'first':
+            expect = 'end'
+            pos += 1
+            continue
+
+        if char not in '{["' and not eof and not _SCALAR_END.search(buffer, pos):
+            # A number or literal is only complete once its delimiter has arrived
+            fill()
+            continue
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            fill()
+            continue
+        pos = end
+        expect = 'separator'
+        yield item
+
+
+# Compiled JSON path expressions kept in the LRU cache
+JSON_PATH_CACHE_SIZE = 512
+
+_PATH_TOKEN = re.compile(
+    r"""\.\.(?P<descend>[A-Za-z_][\w-]*|\*)"""
+    r"""|\.(?P<name>[A-Za-z_][\w-]*|\*)"""
+    r"""|\[\s*(?P<quoted>'[^']*'|"[^"]*")\s*\]"""
+    r"""|\[\s*(?P<slice>-?\d*\s*:\s*-?\d*)\s*\]"""
+    r"""|\[\s*(?P<index>-?\d+)\s*\]"""
+    r"""|\[\s*(?P<wildcard>\*)\s*\]"""
+    r"""|\[\s*\?\(?\s*(?P<filter>.+?)\s*\)?\s*\]"""
+)
+_FILTER = re.compile(r"""^@?\.?(?P<field>[\w.-]+)\s*(?:(?P<op>==|!=|<=|>=|<|>)\s*(?P<value>.+))?$""")
+_FILTER_OPS = {
+    '==': lambda a, b: a == b,
+    '!=': lambda a, b: a != b,
+    '<': lambda a, b: a < b,
+    '<=': lambda a, b: a <= b,
+    '>': lambda a, b: a > b,
+    '>=': lambda a, b: a >= b,
+}
+_MISSING = object()
+
+# Compiled expected JSON documents kept in the LRU cache
+JSON_EXPECTATION_CACHE_SIZE = 256
+
+
+def _children(node):
+    if isinstance(node, dict):
+        return list(node.values())
+    if isinstance(node, list):
+        return node
+    return []
+
+
+def _descendants(node):
+    yield node
+    for child in _children(node):
+        yield from _descendants(child)
+
+
+def _lookup(node, dotted_field):
+    for part in dotted_field.split('.'):
+        if not isinstance(node, dict) or part not in node:
+            return _MISSING
+        node = node[part]
+    return node
+
+
+def _filter_literal(text):
+    text = text.strip()
+    if text[:1] in ("'", '"') and text[-1:] == text[:1]:
+        return text[1:-1]
+    literals = {'true': True, 'false': False, 'null': None}
+    if text in literals:
+        return literals[text]
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def _compile_filter(expression):
+    match = _FILTER.match(expression)
+    if not match:
+        raise ValueError(f"Unsupported filter expression '{expression}'")
+    field = match.group('field')
+    if not match.group('op'):
+        return lambda item: _lookup(item, field) is not _MISSING
+    compare = _FILTER_OPS[match.group('op')]
+    expected = _filter_literal(match.group('value'))
+
+    def predicate(item):
+        actual = _lookup(item, field)
+        if actual is _MISSING:
+            return False
+        try:
+            return compare(actual, expected)
+        except TypeError:
+            return False
+    return predicate
+
+
+def _compile_step(token):
+    kind = token.lastgroup
+    value = token.group(kind)
+    if kind in ('name', 'quoted'):
+        if kind == 'quoted':
+            value = value[1:-1]
+        if value == '*' and kind == 'name':
+            return lambda nodes: [child for node in nodes for child in _children(node)]
+        return lambda nodes: [node[value] for node in nodes if isinstance(node, dict) and value in node]
+    if kind == 'wildcard':
+        return lambda nodes: [child for node in nodes for child in _children(node)]
+    if kind == 'index':
+        index = int(value)
+
+        def pick(nodes):
+            return [node[index] for node in nodes
+                    if isinstance(node, list) and -len(node) <= index < len(node)]
+        return pick
+    if kind == 'slice':
+        start, stop = (int(part) if part.strip() else None for part in value.split(':'))
+        return lambda nodes: [item for node in nodes if isinstance(node, list) for item in node[start:stop]]
+    if kind == 'filter':
+        predicate = _compile_filter(value)
+        return lambda nodes: [child for node in nodes for child in _children(node) if predicate(child)]
+    # Recursive descent
+    if value == '*':
+        return lambda nodes: [d for node in nodes for child in _children(node) for d in _descendants(child)]
+    return lambda nodes: [d[value] for node in nodes for d in _descendants(node)
+                          if isinstance(d, dict) and value in d]
+
+
+@functools.lru_cache(maxsize=JSON_PATH_CACHE_SIZE)
+def _compile_json_path(expression):
+    """Compile a JSON path such as $.items[*].film_id into a list of steps
+
+    Supported syntax: $ root, .key, ['key'], [n], [start:end], [*], .*, ..key
+    (recursive descent) and filters such as [?rating=='PG'] or [?(@.rate > 2.5)].
+    """
+    path = expression.strip()
+    offset = 1
+    if path.startswith('$'):
+        path = path[1:]
+        offset = 2
+    elif path and path[0] not in '.[':
+        path = '.' + path
+        offset = 0
+
+    steps = []
+    pos = 0
+    while pos < len(path):
+        token = _PATH_TOKEN.match(path, pos)
+        if not token:
+            raise ValueError(f"Invalid JSON path '{expression}' at position {pos + offset}")
+        steps.append(_compile_step(token))
+        pos = token.end()
+    return tuple(steps)
+
+
+def _compile_json_check(expected, path=''):
+    """Compile an expected JSON value into check(actual) returning the first error or None"""
+    expected_type = type(expected)
+    type_error = f"Type mismatch at {path}: expected {expected_type.__name__}, got %s"
+
+    if isinstance(expected, dict):
+        children = tuple(
+            (key, f"Missing key '{key}' at {path}", _compile_json_check(value, f"{path}.{key}" if path else key))
+            for key, value in expected.items()
+        )
+
+        def check(actual):
+            if type(actual) is not expected_type:
+                return type_error % type(actual).__name__
+            for key, missing, child in children:
+                if key not in actual:
+                    return missing
+                error = child(actual[key])
+                if error:
+                    return error
+            return None
+    elif isinstance(expected, list):
+        items = tuple(_compile_json_check(value, f"{path}[{i}]") for i, value in enumerate(expected))
+
+        def check(actual):
+            if type(actual) is not expected_type:
+                return type_error % type(actual).__name__
+            if len(actual) != len(items):
+                return f"List length mismatch at {path}: expected {len(items)}, got {len(actual)}"
+            for item, value in zip(items, actual):
+                error = item(value)
+                if error:
+                    return error
+            return None
+    else:
+        def check(actual):
+            if type(actual) is not expected_type:
+                return type_error % type(actual).__name__
+            if actual != expected:
+                return f"Value mismatch at {path}: expected {expected}, got {actual}"
+            return None
+    return check
+
+
+@functools.lru_cache(maxsize=JSON_EXPECTATION_CACHE_SIZE)
+def _compile_json_expectation(text):
+    """Compiled check for an expected JSON document, cached by its text"""
+    return _compile_json_check(json.loads(text))
+
+
+_compiled_json_values = OrderedDict()
+_compiled_json_values_lock = threading.Lock()
+
+
+def _json_value_key(value):
+    """Hashable key of an expected value that keeps its types (1, '1', True and (1,) differ)"""
+    if isinstance(value, dict):
+        return dict, tuple((_json_value_key(key), _json_value_key(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return type(value), tuple(_json_value_key(item) for item in value)
+    return type(value), value
+
+
+def _compile_json_value(expected):
+    """Compiled check for an expected dict or list, cached by its content"""
+    key = _json_value_key(expected)
+    try:
+        with _compiled_json_values_lock:
+            check = _compiled_json_values.get(key)
+            if check is not None:
+                _compiled_json_values.move_to_end(key)
+                return check
+    except TypeError:
+        # Unhashable values (e.g. sets): compile without caching
+        return _compile_json_check(expected)
+    check = _compile_json_check(copy.deepcopy(expected))
+    with _compiled_json_values_lock:
+        _compiled_json_values[key] = check
+        if len(_compiled_json_values) > JSON_EXPECTATION_CACHE_SIZE:
+            _compiled_json_values.popitem(last=False)
+    return check
+
+
+def _evaluate_json_path(expression, data):
+    """Return every value matched by a JSON path expression"""
+    nodes = [data]
+    for step in _compile_json_path(expression):
+        nodes = step(nodes)
+        if not nodes:
+            break
+    return nodes
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of sending a request while a host's circuit is open"""
+
+
+class _CircuitBreaker:
+    """Per-host circuit breaker
+
+    A host's circuit opens after `failure_threshold` consecutive failures
+    (any exception while sending, such as connection errors, timeouts or retries
+    exhausted, or 502/503/504 responses). While open, requests
+    fail fast. After `reset_timeout` seconds one trial request is let through
+    (half-open); success closes the circuit, failure opens it again.
+    """
+
+    FAILURE_STATUSES = (502, 503, 504)
+
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.hosts = {}
+        self.lock = threading.Lock()
+
+    def before_request(self, host):
+        with self.lock:
+            state = self.hosts.get(host)
+            if not state or state['state'] == 'closed':
+                return
+            if state['state'] == 'open' and time.monotonic() - state['opened_at'] >= self.reset_timeout:
+                state['state'] = 'half-open'
+                return
+            raise CircuitOpenError(
+                f"Circuit open for {host} after {state['failures']} consecutive failures"
+            )
+
+    def record(self, host, failed):
+        with self.lock:
+            state = self.hosts.setdefault(host, {'state': 'closed', 'failures': 0, 'opened_at': None})
+            if not failed:
+                state.update(state='closed', failures=0, opened_at=None)
+                return
+            state['failures'] += 1
+            if state['state'] == 'half-open' or state['failures'] >= self.failure_threshold:
+                state['state'] = 'open'
+                state['opened_at'] = time.monotonic()
+
+    def snapshot(self):
+        with self.lock:
+            return {host: {'state': state['state'], 'failures': state['failures']}
+                    for host, state in self.hosts.items()}
+
+
+class CassetteMissError(requests.exceptions.RequestException):
+    """Raised in replay mode when no recorded interaction matches a request"""
+
+
+class _Cassette:
+    """On-disk store of recorded request/response interactions
+
+    Interactions are appended to a gzip-compressed JSON Lines file. On load they are
+    indexed by a hash of the configured match rules, so replay lookups are O(1) and
+    a cassette can be replayed with different match rules than it was recorded with.
+    Identical requests recorded several times are replayed in recording order, and
+    the last recording is reused once they run out.
+    """
+
+    MATCH_RULES = ('method', 'url', 'path', 'query', 'body')
+    SKIPPED_HEADERS = ('content-encoding', 'transfer-encoding', 'content-length', 'connection')
+
+    def __init__(self, path, mode, match_on):
+        for rule in match_on:
+            if rule not in self.MATCH_RULES and not rule.startswith('header:'):
+                raise ValueError(
+                    f"Unknown cassette match rule '{rule}', expected one of {list(self.MATCH_RULES)} or header:<name>"
+                )
+        self.path = path
+        self.mode = mode
+        self.match_on = match_on
+        self.index = {}
+        self.positions = {}
+        self.stats = {'recorded': 0, 'replayed': 0, 'misses': 0}
+        self.lock = threading.Lock()
+        self.file = None
+
+        if mode != 'record' and os.path.exists(path):
+            self._load()
+        if self.recording:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.file = gzip.open(path, 'wt' if mode == 'record' else 'at', encoding='utf-8')
+
+    @property
+    def recording(self):
+        return self.mode != 'replay'
+
+    def _load(self):
+        with gzip.open(self.path, 'rt', encoding='utf-8') as cassette_file:
+            try:
+                for line in cassette_file:
+                    if line.strip():
+                        interaction = json.loads(line)
+                        key = self.key(interaction['method'], interaction['url'],
+                                       interaction['request_body'], interaction['request_headers'])
+                        self.index.setdefault(key, []).append(interaction)
+            except EOFError:
+                # A run that was interrupted while recording leaves a truncated last member
+                pass
+
+    def key(self, method, url, body, headers):
+        parsed = urlparse(url)
+        parts = []
+        for rule in self.match_on:
+            if rule == 'method':
+                parts.append(method.upper())
+            elif rule == 'url':
+                parts.append(url)
+            elif rule == 'path':
+                parts.append(parsed.path)
+            elif rule == 'query':
+                parts.append('&'.join(f"{k}={v}" for k, v in sorted(parse_qsl(parsed.query))))
+            elif rule == 'body':
+                parts.append(self.normalize_body(body))
+            else:
+                name = rule.split(':', 1)[1].strip().lower()
+                value = next((v for k, v in (headers or {}).items() if k.lower() == name), '')
+                parts.append(str(value))
+        return hashlib.sha1('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def normalize_body(body):
+        """Canonical text of a request body; JSON bodies compare independent of key order"""
+        if body is None:
+            return ''
+        if isinstance(body, bytes):
+            body = body.decode('utf-8', errors='replace')
+        body = str(body).strip()
+        try:
+            return json.dumps(json.loads(body), sort_keys=True, separators=(',', ':'))
+        except ValueError:
+            return body
+
+    def replay(self, method, url, body, headers):
+        if self.mode == 'record':
+            return None
+        key = self.key(method, url, body, headers)
+        with self.lock:
+            interactions = self.index.get(key)
+            if not interactions:
+                self.stats['misses'] += 1
+                return None
+            position = self.positions.get(key, 0)
+            self.positions[key] = position + 1
+            interaction = interactions[min(position, len(interactions) - 1)]
+            self.stats['replayed'] += 1
+
+        response = requests.Response()
+        response.status_code = interaction['status']
+        response.reason = interaction.get('reason') or 'Replayed'
+        response.headers = requests.structures.CaseInsensitiveDict(interaction['headers'])
+        if interaction['body_encoding'] == 'base64':
+            response._content = base64.b64decode(interaction['body'])
+        else:
+            response._content = interaction['body'].encode('utf-8')
+        response._content_consumed = True
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.url = url
+        response.elapsed = timedelta(0)
+        response.phase_timings = {'connect': 0.0, 'tls': 0.0, 'ttfb': 0.0, 'download': 0.0, 'total': 0.0}
+        return response
+
+    def record(self, method, url, body, headers, response):
+        content = response.content
+        try:
+            response_body = content.decode('utf-8')
+            body_encoding = 'utf-8'
+        except UnicodeDecodeError:
+            response_body = base64.b64encode(content).decode('ascii')
+            body_encoding = 'base64'
+        interaction = {
+            'method': method,
+            'url': url,
+            'request_headers': dict(headers or {}),
+            'request_body': self.normalize_body(body),
+            'status': response.status_code,
+            'reason': response.reason,
+            'headers': {k: v for k, v in response.headers.items() if k.lower() not in self.SKIPPED_HEADERS},
+            'body': response_body,
+            'body_encoding': body_encoding,
+        }
+        with self.lock:
+            self.file.write(json.dumps(interaction) + '\n')
+            self.index.setdefault(self.key(method, url, body, headers), []).append(interaction)
+            self.stats['recorded'] += 1
+
+    def close(self):
+        with self.lock:
+            if self.file:
+                self.file.close()
+                self.file = None
+
+
+class _ResponseCache:
+    """Size-bounded LRU cache of GET responses with a time-to-live
+
+    Entries past their TTL are revalidated with If-None-Match / If-Modified-Since
+    when the server sent an ETag or Last-Modified header, so a 304 reuses the
+    cached response and its already-parsed body. Entries are keyed by URL and
+    the request headers in KEY_HEADERS, which change the content returned.
+    """
+
+    KEY_HEADERS = ('accept', 'accept-encoding', 'accept-language', 'authorization', 'cookie')
+
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.stats = {'hits': 0, 'misses': 0, 'revalidations': 0, 'invalidations': 0}
+        self.lock = threading.Lock()
+
+    @classmethod
+    def key(cls, url, headers):
+        varying = sorted(
+            (name.lower(), str(value)) for name, value in (headers or {}).items()
+            if name.lower() in cls.KEY_HEADERS
+        )
+        return url, tuple(varying)
+
+    def lookup(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            return entry
+
+    def is_fresh(self, entry):
+        return time.monotonic() - entry['stored_at'] < self.ttl
+
+    @staticmethod
+    def conditional_headers(entry, headers):
+        validators = {}
+        if entry['etag']:
+            validators['If-None-Match'] = entry['etag']
+        if entry['last_modified']:
+            validators['If-Modified-Since'] = entry['last_modified']
+        if not validators:
+            return headers
+        return {**headers, **validators}
+
+    def store(self, key, response, body):
+        entry = {
+            'response': response,
+            # A copy, so changes to the body the caller already holds never reach the cache
+            'body': copy.deepcopy(body),
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'stored_at': time.monotonic(),
+        }
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, url):
+        """Drop entries for the resource, its sub-resources and its parent collections"""
+        target = urlparse(url)
+        target_path = target.path.rstrip('/') or '/'
+        with self.lock:
+            for key in list(self.entries):
+                cached = urlparse(key[0])
+                if cached.netloc != target.netloc:
+                    continue
+                cached_path = cached.path.rstrip('/') or '/'
+                if (cached_path == target_path
+                        or cached_path.startswith(target_path.rstrip('/') + '/')
+                        or target_path.startswith(cached_path.rstrip('/') + '/')):
+                    del self.entries[key]
+                    self.stats['invalidations'] += 1
+
+
+# Connect/TLS durations of the connection opened by the current thread's request
+_phase_timings = threading.local()
+
+
+class _TimedConnectionMixin:
+    """Record TCP connect and TLS handshake durations of new connections"""
+
+    def _new_conn(self):
+        started = time.perf_counter()
+        try:
+            return super()._new_conn()
+        finally:
+            _phase_timings.connect = time.perf_counter() - started
+
+    def connect(self):
+        started = time.perf_counter()
+        _phase_timings.connect = 0.0
+        super().connect()
+        _phase_timings.tls = max(0.0, time.perf_counter() - started - _phase_timings.connect)
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections report connect and TLS timings"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _TimedHTTPConnectionPool,
+            'https': _TimedHTTPSConnectionPool,
+        }
+
+
+class _LazyJSON:
+    """Serialize a value to JSON only when it is formatted into a log message"""
+
+    def __init__(self, value):
+        self.value = value
+
+    def __str__(self):
+        return json.dumps(self.value, default=str)
+
+
+class APIKeywords(LoggingPolicy):
     ROBOT_LIBRARY_SCOPE = 'GLOBAL'
 
     def __init__(self):
         self.session = requests.Session()
         self.last_response = None
-        self.last_response_body = None
+        self._last_response_body = None
+        self._pending_response = None
+        self._stream_consumed = False
+        self.response_parsing_mode = 'eager'
         self.last_status_code = None
         self.base_url = None
         self.headers = {}
+        self._content_headers_cache = {}
         self.response_time = None
+        self.pool_connections = DEFAULT_POOLSIZE
+        self.pool_maxsize = DEFAULT_POOLSIZE
+        self.retry_policy = None
+        self.timeout = 30
+        self.circuit_breaker = None
+        self.last_request_timing = None
+        self.metrics_file = None
+        self.metrics_format = None
+        self.metrics_writer = None
+        self.metrics_lock = threading.Lock()
+        self.metrics_summary = {}
+        self._last_parse_time = None
+        self._init_logging_policy()
+        self.ROBOT_LIBRARY_LISTENER = LogSamplingListener(self)
+        self.last_batch_results = []
+        self.last_load_test_results = None
+        self.cassette = None
+        self.response_cache = None
+        self.record_tracking_rules = {}
+        self.created_records = {}
+        self.created_records_lock = threading.Lock()
+        self._mount_adapters()
+
+    @keyword
+    def set_api_logging_policy(self, level='INFO', max_length=None, sample_every=1):
+        """Control how much APIKeywords logs
+
+        Args:
+            level: Minimum level logged: TRACE, DEBUG, INFO (default), WARN or NONE
+            max_length: Truncate each logged message to this many characters (default: no limit)
+            sample_every: Inside FOR/WHILE loops, log only 1 in N iterations (default: every iteration)
+        """
+        self._set_logging_policy(level, max_length, sample_every)
 
     @keyword
     def set_base_url(self, url):
         """Set the base URL for API requests"""
         self.base_url = url
-        BuiltIn().log(f"Base URL set to: {self.base_url}")
+        self._log("Base URL set to: %s", self.base_url)
 
     @keyword
     def set_headers(self, headers_dict):
@@ -42,19 +777,298 @@ class APIKeywords:
             self.headers = json.loads(headers_dict)
         else:
             self.headers = headers_dict
-        BuiltIn().log(f"Headers set: {self.headers}")
+        self._content_headers_cache = {}
+        self._log("Headers set: %s", self.headers)
 
     @keyword
     def add_header(self, key, value):
         """Add a single header"""
         self.headers[key] = value
-        BuiltIn().log(f"Header added: {key}: {value}")
+        self._content_headers_cache = {}
+        self._log("Header added: %s: %s", key, value)
 
     @keyword
     def clear_headers(self):
         """Clear all headers"""
         self.headers = {}
-        BuiltIn().log("All headers cleared")
+        self._content_headers_cache = {}
+        self._log("All headers cleared")
+
+    @property
+    def last_response_body(self):
+        """Parsed body of the last response, decoded on first access in lazy/stream mode"""
+        if self._pending_response is not None:
+            response = self._pending_response
+            self._pending_response = None
+            self._last_response_body = self._parse_response_body(response)
+        return self._last_response_body
+
+    @last_response_body.setter
+    def last_response_body(self, value):
+        self._pending_response = None
+        self._last_response_body = value
+
+    @keyword
+    def set_response_parsing_mode(self, mode='eager'):
+        """Set how response bodies are parsed
+
+        Args:
+            mode: 'eager' parses every body right after the request (default),
+                  'lazy' keeps the raw bytes and parses only when the body is first used,
+                  'stream' is like 'lazy' but GET bodies are not downloaded up front, so
+                  JSON array responses can be walked item by item with the
+                  streamed response keywords in constant memory
+        """
+        mode = mode.lower()
+        if mode not in ('eager', 'lazy', 'stream'):
+            BuiltIn().fail(f"Unknown response parsing mode '{mode}', expected eager, lazy or stream")
+        self._release_streamed_response()
+        self.response_parsing_mode = mode
+        self._log("Response parsing mode set to: %s", mode)
+
+    @keyword
+    def get_streamed_response_item_count(self):
+        """Count the items of a streamed JSON array response without keeping them in memory
+
+        Returns:
+            Number of items in the array
+        """
+        count = 0
+        for _ in self._iter_streamed_items():
+            count += 1
+        self._log("Streamed response contains %s items", count)
+        return count
+
+    @keyword
+    def streamed_response_items_should_contain_keys(self, *keys):
+        """Verify every item of a streamed JSON array response contains the given keys
+
+        Args:
+            keys: Keys that every item must contain
+        """
+        failures = []
+        failure_count = 0
+        count = 0
+        for index, item in enumerate(self._iter_streamed_items()):
+            count += 1
+            missing = [key for key in keys if not isinstance(item, dict) or key not in item]
+            if missing:
+                failure_count += 1
+                if len(failures) < 20:
+                    failures.append(f"  - Item {index}: missing {missing}")
+
+        if failure_count:
+            more = f"\n  ... and {failure_count - len(failures)} more" if failure_count > len(failures) else ""
+            BuiltIn().fail(
+                f"{failure_count} of {count} streamed items are missing keys:\n" + "\n".join(failures) + more
+            )
+        self._log("All %s streamed items contain keys: %s", count, list(keys))
+
+    @keyword
+    def streamed_response_should_contain_item(self, key, expected_value):
+        """Find the first item of a streamed JSON array response whose key matches a value
+
+        Reading stops as soon as the item is found.
+
+        Args:
+            key: Key to compare
+            expected_value: Expected value (compared as strings)
+
+        Returns:
+            The matching item
+        """
+        expected = str(expected_value)
+        for item in self._iter_streamed_items():
+            if isinstance(item, dict) and key in item and str(item[key]) == expected:
+                self._release_streamed_response()
+                self._log("Streamed response contains item with %s = %s", key, expected)
+                return item
+        BuiltIn().fail(f"No streamed item with {key} = {expected} found")
+
+    @keyword
+    def configure_http_transport(self, pool_connections=10, pool_maxsize=10, keep_alive=True,
+                                 connect_timeout=5, read_timeout=30, max_retries=0,
+                                 backoff_factor=0.5, backoff_max=30, backoff_jitter=0.5,
+                                 retry_on_status='429,502,503,504', retry_non_idempotent=False,
+                                 circuit_breaker_threshold=0, circuit_breaker_reset=30):
+        """Configure connection pooling, timeouts, retries and circuit breaking
+
+        Retries use exponential backoff with random jitter and honor Retry-After
+        headers. Only idempotent methods (GET, PUT, DELETE, HEAD, OPTIONS, TRACE)
+        are retried after a request was sent, unless retry_non_idempotent is set;
+        connection failures are retried for every method.
+
+        Args:
+            pool_connections: Number of per-host connection pools to cache
+            pool_maxsize: Maximum connections kept per host
+            keep_alive: Reuse connections between requests (default: True)
+            connect_timeout: Connect timeout in seconds
+            read_timeout: Read timeout in seconds
+            max_retries: Maximum retries per request (0 disables retries)
+            backoff_factor: Base of the exponential backoff in seconds
+            backoff_max: Upper bound of a single backoff sleep in seconds
+            backoff_jitter: Maximum random jitter added to each backoff in seconds
+            retry_on_status: Comma-separated status codes that trigger a retry
+            retry_non_idempotent: Also retry POST/PATCH after the request was sent
+            circuit_breaker_threshold: Consecutive failures that open a host's circuit (0 disables)
+            circuit_breaker_reset: Seconds before an open circuit lets a trial request through
+        """
+        max_retries = int(max_retries)
+        if max_retries > 0:
+            if isinstance(retry_on_status, str):
+                retry_on_status = [code for code in retry_on_status.split(',') if code.strip()]
+            allowed_methods = None if self._to_bool(retry_non_idempotent) else Retry.DEFAULT_ALLOWED_METHODS
+            retry_options = {
+                'total': max_retries,
+                'status_forcelist': [int(code) for code in retry_on_status],
+                'allowed_methods': allowed_methods,
+                'backoff_factor': float(backoff_factor),
+                'backoff_max': float(backoff_max),
+                'backoff_jitter': float(backoff_jitter),
+                'respect_retry_after_header': True,
+                'raise_on_status': False,
+            }
+            # Older urllib3 releases lack backoff_max/backoff_jitter
+            supported = inspect.signature(Retry.__init__).parameters
+            self.retry_policy = Retry(**{k: v for k, v in retry_options.items() if k in supported})
+        else:
+            self.retry_policy = None
+
+        self.pool_connections = int(pool_connections)
+        self.pool_maxsize = int(pool_maxsize)
+        self._mount_adapters()
+
+        if self._to_bool(keep_alive):
+            self.session.headers.pop('Connection', None)
+        else:
+            self.session.headers['Connection'] = 'close'
+
+        if connect_timeout in (None, '', 'None'):
+            self.timeout = float(read_timeout)
+        else:
+            self.timeout = (float(connect_timeout), float(read_timeout))
+
+        threshold = int(circuit_breaker_threshold)
+        self.circuit_breaker = _CircuitBreaker(threshold, float(circuit_breaker_reset)) if threshold > 0 else None
+
+        self._log(
+            "HTTP transport: pool %sx%s, keep-alive %s, timeout %s, retries %s, circuit breaker threshold %s",
+            self.pool_connections, self.pool_maxsize, self._to_bool(keep_alive), self.timeout, max_retries,
+            threshold,
+        )
+
+    @keyword
+    def get_circuit_breaker_state(self):
+        """Get the circuit breaker state and consecutive failure count per host"""
+        if not self.circuit_breaker:
+            return {}
+        return self.circuit_breaker.snapshot()
+
+    @keyword
+    def reset_circuit_breaker(self):
+        """Close all circuits and clear failure counts"""
+        if self.circuit_breaker:
+            self.circuit_breaker = _CircuitBreaker(
+                self.circuit_breaker.failure_threshold, self.circuit_breaker.reset_timeout
+            )
+        self._log("Circuit breaker reset")
+
+    @keyword
+    def start_cassette(self, path, mode='replay_or_record', match_on='method,url,body'):
+        """Record requests to, or answer them from, an on-disk cassette
+
+        Args:
+            path: Cassette file (gzip-compressed JSON Lines, e.g. cassettes/film.jsonl.gz)
+            mode: 'record' overwrites the cassette with live responses,
+                  'replay' answers only from the cassette and fails on unmatched requests,
+                  'replay_or_record' replays matches and records everything else
+            match_on: Comma-separated request attributes that must match: method, url,
+                      path, query, body (JSON compared independent of key order) and
+                      header:<name>
+        """
+        mode = mode.lower()
+        if mode not in ('record', 'replay', 'replay_or_record'):
+            BuiltIn().fail(f"Unknown cassette mode '{mode}', expected record, replay or replay_or_record")
+        if mode == 'replay' and not os.path.exists(path):
+            BuiltIn().fail(f"Cassette not found: {path}")
+        self.stop_cassette()
+
+        if isinstance(match_on, str):
+            match_on = [rule.strip() for rule in match_on.split(',') if rule.strip()]
+        try:
+            self.cassette = _Cassette(path, mode, match_on)
+        except (ValueError, OSError) as e:
+            BuiltIn().fail(f"Could not open cassette: {str(e)}")
+        self._log("Cassette %s started in %s mode, matching on %s", path, mode, match_on)
+
+    @keyword
+    def stop_cassette(self):
+        """Stop recording/replaying and close the cassette file
+
+        Returns:
+            Cassette statistics (see Get Cassette Stats), or None if no cassette was active
+        """
+        if not self.cassette:
+            return None
+        stats = self.get_cassette_stats()
+        self.cassette.close()
+        self.cassette = None
+        self._log("Cassette stopped: %s", stats)
+        return stats
+
+    @keyword
+    def get_cassette_stats(self):
+        """Get the number of recorded, replayed and unmatched requests of the active cassette"""
+        if not self.cassette:
+            BuiltIn().fail("No cassette is active")
+        return dict(self.cassette.stats)
+
+    @keyword
+    def enable_response_cache(self, max_entries=256, ttl=60):
+        """Cache GET responses and reuse their parsed bodies
+
+        Fresh entries are served without a request. Entries older than `ttl` are
+        revalidated with If-None-Match / If-Modified-Since when the server sent an
+        ETag or Last-Modified header. POST, PUT and DELETE requests invalidate the
+        cached entries of the same resource, its sub-resources and its parent
+        collections. Entries are keyed by URL plus the Accept, Accept-Encoding,
+        Accept-Language, Authorization and Cookie headers. GET requests with explicit
+        headers or in stream parsing mode bypass the cache.
+
+        Args:
+            max_entries: Maximum cached responses (least recently used are evicted)
+            ttl: Seconds an entry is served without contacting the server
+        """
+        self.response_cache = _ResponseCache(int(max_entries), float(ttl))
+        self._log("Response cache enabled: %s entries, TTL %ss", max_entries, ttl)
+
+    @keyword
+    def disable_response_cache(self):
+        """Stop caching GET responses and drop all cached entries"""
+        self.response_cache = None
+        self._log("Response cache disabled")
+
+    @keyword
+    def clear_response_cache(self):
+        """Drop all cached GET responses, keeping the statistics"""
+        if self.response_cache:
+            with self.response_cache.lock:
+                self.response_cache.entries.clear()
+        self._log("Response cache cleared")
+
+    @keyword
+    def get_response_cache_stats(self):
+        """Get response cache counters
+
+        Returns:
+            Dictionary with hits, misses, revalidations (304 responses), invalidations
+            and the current number of entries
+        """
+        if not self.response_cache:
+            BuiltIn().fail("Response cache is not enabled")
+        stats = dict(self.response_cache.stats)
+        stats['entries'] = len(self.response_cache.entries)
+        return stats
 
     @keyword
     def perform_get_request(self, endpoint, headers=None):
@@ -69,16 +1083,52 @@ class APIKeywords:
         """
         url = self._build_url(endpoint)
         req_headers = headers if headers else self.headers
+        cache = self.response_cache
+        if headers or self.response_parsing_mode == 'stream':
+            cache = None
 
         try:
-            self.last_response = self.session.get(url, headers=req_headers, timeout=30)
+            self._release_streamed_response()
+            cache_key = cache.key(url, req_headers) if cache else None
+            entry = cache.lookup(cache_key) if cache else None
+            if entry is not None and cache.is_fresh(entry):
+                cache.stats['hits'] += 1
+                self._use_cached_response(entry)
+                self.response_time = 0.0
+                self.last_request_timing = None
+                self._log("GET request to %s served from cache", url)
+                return self.last_status_code
+
+            send_headers = cache.conditional_headers(entry, req_headers) if entry is not None else req_headers
+            self.last_response = self._send_request(
+                'GET', url, headers=send_headers, stream=self.response_parsing_mode == 'stream'
+            )
+            if entry is not None and self.last_response.status_code == 304:
+                cache.stats['revalidations'] += 1
+                timing_response = self.last_response
+                entry['stored_at'] = time.monotonic()
+                self._use_cached_response(entry)
+                self.response_time = timing_response.elapsed.total_seconds()
+                self.last_request_timing = self._record_request_timing('GET', endpoint, timing_response, None, None)
+                self._log("GET request to %s revalidated (304), cached body reused", url)
+                return self.last_status_code
+
             self.last_status_code = self.last_response.status_code
-            self.last_response_body = self._parse_response_body(self.last_response)
+            self._load_response_body(self.last_response)
             self.response_time = self.last_response.elapsed.total_seconds()
+            self.last_request_timing = self._record_request_timing(
+                'GET', endpoint, self.last_response, None, self._last_parse_time
+            )
+            if cache:
+                cache.stats['misses'] += 1
+                if self.last_status_code == 200:
+                    # In lazy mode the body is parsed on the first cache hit instead
+                    parsed = self._last_response_body if self._pending_response is None else None
+                    cache.store(cache_key, self.last_response, parsed)
 
-            BuiltIn().log(f"GET request to {url}")
-            BuiltIn().log(f"Status Code: {self.last_status_code}")
-            BuiltIn().log(f"Response Time: {self.response_time}s")
+            self._log("GET request to %s", url)
+            self._log("Status Code: %s", self.last_status_code)
+            self._log("Response Time: %ss", self.response_time)
 
             return self.last_status_code
         except Exception as e:
@@ -98,30 +1148,25 @@ class APIKeywords:
             Response status code
         """
         url = self._build_url(endpoint)
-        req_headers = headers if headers else self.headers.copy()
-
-        # Set content type based on payload type
-        if payload_type.lower() == 'json':
-            if 'Content-Type' not in req_headers:
-                req_headers['Content-Type'] = 'application/json'
-            request_body = json.dumps(payload) if isinstance(payload, dict) else payload
-        elif payload_type.lower() == 'xml':
-            if 'Content-Type' not in req_headers:
-                req_headers['Content-Type'] = 'application/xml'
-            request_body = payload if isinstance(payload, str) else ET.tostring(payload, encoding='unicode')
-        else:
-            request_body = payload
+        request_body, req_headers = self._prepare_request(payload, payload_type, headers)
 
         try:
-            self.last_response = self.session.post(url, data=request_body, headers=req_headers, timeout=30)
+            self._release_streamed_response()
+            if self.response_cache:
+                self.response_cache.invalidate(url)
+            self.last_response = self._send_request('POST', url, data=request_body, headers=req_headers)
+            self._add_created_records(getattr(self.last_response, 'created_records', None))
             self.last_status_code = self.last_response.status_code
-            self.last_response_body = self._parse_response_body(self.last_response)
+            self._load_response_body(self.last_response)
             self.response_time = self.last_response.elapsed.total_seconds()
+            self.last_request_timing = self._record_request_timing(
+                'POST', endpoint, self.last_response, request_body, self._last_parse_time
+            )
 
-            BuiltIn().log(f"POST request to {url}")
-            BuiltIn().log(f"Payload Type: {payload_type}")
-            BuiltIn().log(f"Status Code: {self.last_status_code}")
-            BuiltIn().log(f"Response Time: {self.response_time}s")
+            self._log("POST request to %s", url)
+            self._log("Payload Type: %s", payload_type)
+            self._log("Status Code: %s", self.last_status_code)
+            self._log("Response Time: %ss", self.response_time)
 
             return self.last_status_code
         except Exception as e:
@@ -141,28 +1186,23 @@ class APIKeywords:
             Response status code
         """
         url = self._build_url(endpoint)
-        req_headers = headers if headers else self.headers.copy()
-
-        if payload_type.lower() == 'json':
-            if 'Content-Type' not in req_headers:
-                req_headers['Content-Type'] = 'application/json'
-            request_body = json.dumps(payload) if isinstance(payload, dict) else payload
-        elif payload_type.lower() == 'xml':
-            if 'Content-Type' not in req_headers:
-                req_headers['Content-Type'] = 'application/xml'
-            request_body = payload if isinstance(payload, str) else ET.tostring(payload, encoding='unicode')
-        else:
-            request_body = payload
+        request_body, req_headers = self._prepare_request(payload, payload_type, headers)
 
         try:
-            self.last_response = self.session.put(url, data=request_body, headers=req_headers, timeout=30)
+            self._release_streamed_response()
+            if self.response_cache:
+                self.response_cache.invalidate(url)
+            self.last_response = self._send_request('PUT', url, data=request_body, headers=req_headers)
             self.last_status_code = self.last_response.status_code
-            self.last_response_body = self._parse_response_body(self.last_response)
+            self._load_response_body(self.last_response)
             self.response_time = self.last_response.elapsed.total_seconds()
+            self.last_request_timing = self._record_request_timing(
+                'PUT', endpoint, self.last_response, request_body, self._last_parse_time
+            )
 
-            BuiltIn().log(f"PUT request to {url}")
-            BuiltIn().log(f"Status Code: {self.last_status_code}")
-            BuiltIn().log(f"Response Time: {self.response_time}s")
+            self._log("PUT request to %s", url)
+            self._log("Status Code: %s", self.last_status_code)
+            self._log("Response Time: %ss", self.response_time)
 
             return self.last_status_code
         except Exception as e:
@@ -183,14 +1223,20 @@ class APIKeywords:
         req_headers = headers if headers else self.headers
 
         try:
-            self.last_response = self.session.delete(url, headers=req_headers, timeout=30)
+            self._release_streamed_response()
+            if self.response_cache:
+                self.response_cache.invalidate(url)
+            self.last_response = self._send_request('DELETE', url, headers=req_headers)
             self.last_status_code = self.last_response.status_code
-            self.last_response_body = self._parse_response_body(self.last_response)
+            self._load_response_body(self.last_response)
             self.response_time = self.last_response.elapsed.total_seconds()
+            self.last_request_timing = self._record_request_timing(
+                'DELETE', endpoint, self.last_response, None, self._last_parse_time
+            )
 
-            BuiltIn().log(f"DELETE request to {url}")
-            BuiltIn().log(f"Status Code: {self.last_status_code}")
-            BuiltIn().log(f"Response Time: {self.response_time}s")
+            self._log("DELETE request to %s", url)
+            self._log("Status Code: %s", self.last_status_code)
+            self._log("Response Time: %ss", self.response_time)
 
             return self.last_status_code
         except Exception as e:
@@ -206,7 +1252,7 @@ class APIKeywords:
         expected = int(expected_status_code)
         if self.last_status_code != expected:
             BuiltIn().fail(f"Expected status code {expected}, but got {self.last_status_code}")
-        BuiltIn().log(f"Status code {self.last_status_code} matches expected {expected}")
+        self._log("Status code %s matches expected %s", self.last_status_code, expected)
 
     @keyword
     def response_body_should_contain(self, expected_text):
@@ -218,7 +1264,7 @@ class APIKeywords:
 
         if expected_text not in body_str:
             BuiltIn().fail(f"Expected text '{expected_text}' not found in response body")
-        BuiltIn().log(f"Response body contains: {expected_text}")
+        self._log("Response body contains: %s", expected_text)
 
     @keyword
     def response_json_should_equal(self, expected_json):
@@ -227,18 +1273,14 @@ class APIKeywords:
         Args:
             expected_json: Expected JSON as string or dict
         """
-        if isinstance(expected_json, str):
-            expected = json.loads(expected_json)
-        else:
-            expected = expected_json
-
         if isinstance(self.last_response_body, dict):
             actual = self.last_response_body
         else:
             BuiltIn().fail("Response body is not JSON")
 
-        self._compare_json(actual, expected)
-        BuiltIn().log("Response JSON matches expected JSON")
+        # A JSON string is compiled straight from its text, skipping the parse once cached
+        self._compare_json(actual, expected_json)
+        self._log("Response JSON matches expected JSON")
 
     @keyword
     def response_json_should_contain_key(self, key):
@@ -248,11 +1290,13 @@ class APIKeywords:
 
         if key not in self.last_response_body:
             BuiltIn().fail(f"Key '{key}' not found in response JSON")
-        BuiltIn().log(f"Response JSON contains key: {key}")
+        self._log("Response JSON contains key: %s", key)
 
     @keyword
     def response_json_value_should_be(self, key, expected_value):
-        """Verify response JSON value for a specific key"""
+        """Verify response JSON value for a specific key (keys starting with $ are JSON paths)"""
+        if key.startswith('$'):
+            return self.response_json_path_value_should_be(key, expected_value)
         if not isinstance(self.last_response_body, dict):
             BuiltIn().fail("Response body is not JSON")
 
@@ -262,16 +1306,34 @@ class APIKeywords:
         actual_value = self.last_response_body[key]
         if str(actual_value) != str(expected_value):
             BuiltIn().fail(f"Expected '{key}' = {expected_value}, but got {actual_value}")
-        BuiltIn().log(f"JSON key '{key}' = {expected_value}")
+        self._log("JSON key '%s' = %s", key, expected_value)
 
     @keyword
     def get_response_body(self):
         """Get the last response body"""
         return self.last_response_body
 
+    @keyword
+    def log_response_body(self, console=False):
+        """Log the last response body, subject to the API logging policy
+
+        Unlike logging the body variable directly, this honors the policy's
+        level, maximum length and loop sampling.
+
+        Args:
+            console: Also write the body to the console
+        """
+        body = self.last_response_body
+        if isinstance(body, (dict, list)):
+            self._log("%s", _LazyJSON(body), console=self._to_bool(console))
+        else:
+            self._log("%s", body, console=self._to_bool(console))
+
     @keyword
     def get_response_json_value(self, key):
-        """Get value from response JSON by key"""
+        """Get value from response JSON by key (keys starting with $ are JSON paths)"""
+        if key.startswith('$'):
+            return self.get_response_json_path_value(key)
         if not isinstance(self.last_response_body, dict):
             BuiltIn().fail("Response body is not JSON")
 
@@ -290,6 +1352,441 @@ class APIKeywords:
         """Get the response time in seconds"""
         return self.response_time
 
+    @keyword
+    def get_response_json_path_values(self, path):
+        """Get all values matched by a JSON path in the response body
+
+        Args:
+            path: JSON path, e.g. $.items[*].film_id or $.data[?rating=='PG'].title
+
+        Returns:
+            List of matched values (empty if nothing matches)
+        """
+        return self._json_path_values(path)
+
+    @keyword
+    def get_response_json_path_value(self, path):
+        """Get the first value matched by a JSON path in the response body
+
+        Args:
+            path: JSON path, e.g. $.items[0].title
+        """
+        values = self._json_path_values(path)
+        if not values:
+            BuiltIn().fail(f"JSON path '{path}' did not match any value")
+        return values[0]
+
+    @keyword
+    def response_json_path_value_should_be(self, path, expected_value):
+        """Verify the first value matched by a JSON path
+
+        Args:
+            path: JSON path
+            expected_value: Expected value (compared as strings)
+        """
+        actual_value = self.get_response_json_path_value(path)
+        if str(actual_value) != str(expected_value):
+            BuiltIn().fail(f"Expected '{path}' = {expected_value}, but got {actual_value}")
+        self._log("JSON path '%s' = %s", path, expected_value)
+
+    @keyword
+    def response_json_path_values_should_all_be(self, path, expected_value):
+        """Verify every value matched by a JSON path equals the expected value
+
+        Args:
+            path: JSON path, e.g. $[*].language_id
+            expected_value: Expected value (compared as strings)
+        """
+        values = self._json_path_values(path)
+        if not values:
+            BuiltIn().fail(f"JSON path '{path}' did not match any value")
+        expected = str(expected_value)
+        mismatches = [value for value in values if str(value) != expected]
+        if mismatches:
+            BuiltIn().fail(
+                f"{len(mismatches)} of {len(values)} values at '{path}' differ from {expected_value}: "
+                f"{mismatches[:20]}"
+            )
+        self._log("All %s values at '%s' = %s", len(values), path, expected_value)
+
+    @keyword
+    def get_response_json_path_count(self, path):
+        """Get the number of values matched by a JSON path"""
+        return len(self._json_path_values(path))
+
+    @keyword
+    def get_response_json_path_sum(self, path):
+        """Get the sum of the numeric values matched by a JSON path"""
+        values = self._json_path_values(path)
+        try:
+            return sum(float(value) if isinstance(value, str) else value for value in values)
+        except (TypeError, ValueError) as e:
+            BuiltIn().fail(f"Values at '{path}' are not numeric: {str(e)}")
+
+    @keyword
+    def get_response_json_path_unique_values(self, path):
+        """Get the distinct values matched by a JSON path, in first-seen order"""
+        unique = {}
+        for value in self._json_path_values(path):
+            marker = json.dumps(value, sort_keys=True, default=str)
+            unique.setdefault(marker, value)
+        return list(unique.values())
+
+    @keyword
+    def get_json_path_cache_info(self):
+        """Get hit/miss statistics of the compiled JSON path cache"""
+        info = _compile_json_path.cache_info()
+        return {'hits': info.hits, 'misses': info.misses, 'size': info.currsize, 'max_size': info.maxsize}
+
+    @keyword
+    def get_last_request_timing(self):
+        """Get the per-phase timing record of the last request
+
+        Returns:
+            Dictionary with endpoint, method, status, payload sizes and the durations
+            (seconds) of connect, tls, ttfb (time to first byte after connecting),
+            download, parse and total
+        """
+        return self.last_request_timing
+
+    @keyword
+    def enable_request_metrics(self, file_path, file_format='jsonl'):
+        """Append a timing record for every request to a metrics file
+
+        Args:
+            file_path: Path of the metrics file (appended to if it exists)
+            file_format: 'jsonl' or 'csv'
+        """
+        file_format = file_format.lower()
+        if file_format not in ('jsonl', 'csv'):
+            BuiltIn().fail(f"Unsupported metrics format '{file_format}', expected jsonl or csv")
+        self.disable_request_metrics()
+
+        directory = os.path.dirname(file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        write_header = not os.path.exists(file_path) or os.path.getsize(file_path) == 0
+        with self.metrics_lock:
+            self.metrics_file = open(file_path, 'a', newline='', encoding='utf-8', buffering=1)
+            self.metrics_format = file_format
+            if file_format == 'csv':
+                self.metrics_writer = csv.DictWriter(self.metrics_file, fieldnames=METRIC_FIELDS)
+                if write_header:
+                    self.metrics_writer.writeheader()
+        self._log("Request metrics written to: %s", file_path)
+
+    @keyword
+    def disable_request_metrics(self):
+        """Stop writing request timing records to the metrics file"""
+        with self.metrics_lock:
+            if self.metrics_file:
+                self.metrics_file.close()
+            self.metrics_file = None
+            self.metrics_writer = None
+
+    @keyword
+    def get_request_metrics_summary(self):
+        """Get timing statistics per method and endpoint shape (e.g. GET /table/film/{id})
+
+        Returns:
+            Dictionary keyed by endpoint group with count, errors, mean/p95/max total
+            time and the mean duration of each phase (seconds)
+        """
+        summary = {}
+        with self.metrics_lock:
+            for group, stats in self.metrics_summary.items():
+                totals = sorted(stats['totals'])
+                count = len(totals)
+                summary[group] = {
+                    'count': count,
+                    'errors': stats['errors'],
+                    'mean': sum(totals) / count,
+                    'p95': self._percentile(totals, 95),
+                    'max': totals[-1],
+                    'phases': {phase: total / count for phase, total in stats['phases'].items()},
+                }
+        return summary
+
+    @keyword
+    def log_request_metrics_summary(self):
+        """Log a per-endpoint table of request timings, slowest groups first
+
+        Returns:
+            The summary dictionary (see Get Request Metrics Summary)
+        """
+        summary = self.get_request_metrics_summary()
+        lines = [f"{'Endpoint':<40} {'Count':>6} {'Mean':>8} {'P95':>8} {'Max':>8}  Mean phases"]
+        for group, stats in sorted(summary.items(), key=lambda item: item[1]['mean'], reverse=True):
+            phases = ' '.join(f"{name}={value * 1000:.1f}ms" for name, value in stats['phases'].items()
+                              if name != 'total')
+            lines.append(
+                f"{group:<40} {stats['count']:>6} {stats['mean']:>8.4f} {stats['p95']:>8.4f} "
+                f"{stats['max']:>8.4f}  {phases}"
+            )
+        self._log("\n".join(lines))
+        return summary
+
+    @keyword
+    def reset_request_metrics(self):
+        """Clear the in-memory request timing summary"""
+        with self.metrics_lock:
+            self.metrics_summary = {}
+        self.last_request_timing = None
+
+    @keyword
+    def perform_requests_concurrently(self, request_specs, max_workers=10):
+        """Perform a batch of requests concurrently on a bounded worker pool
+
+        Args:
+            request_specs: List of request specs, each a dictionary with 'method',
+                           'endpoint' and optional 'payload', 'payload_type' and 'headers'
+                           keys (JSON string of that list is also accepted)
+            max_workers: Maximum number of requests in flight at the same time
+
+        Returns:
+            List of results in input order, each a dictionary with 'method', 'url',
+            'status_code', 'body', 'response_time', 'timing' and 'error' keys
+        """
+        if isinstance(request_specs, str):
+            request_specs = json.loads(request_specs)
+        specs = [self._normalize_request_spec(spec) for spec in request_specs]
+        max_workers = max(1, int(max_workers))
+
+        if not specs:
+            self.last_batch_results = []
+            return self.last_batch_results
+
+        self._ensure_pool_size(max_workers)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(specs))) as executor:
+            outcomes = list(executor.map(self._execute_request_spec, specs))
+        elapsed = time.perf_counter() - started
+        self.last_batch_results = [result for result, _ in outcomes]
+        for _, created in outcomes:
+            self._add_created_records(created)
+
+        failed = sum(1 for result in self.last_batch_results if result['error'])
+        self._log("Concurrent batch: %s requests with %s workers in %.3fs", len(specs), max_workers, elapsed)
+        if failed:
+            self._log("Requests with errors: %s", failed)
+        return self.last_batch_results
+
+    @keyword
+    def get_batch_results(self):
+        """Get the results of the last concurrent batch"""
+        return self.last_batch_results
+
+    @keyword
+    def batch_status_codes_should_be(self, expected_status_code):
+        """Verify every response of the last concurrent batch has the expected status code
+
+        Args:
+            expected_status_code: Expected HTTP status code
+        """
+        expected = int(expected_status_code)
+        failures = []
+        for index, result in enumerate(self.last_batch_results):
+            if result['error']:
+                failures.append(f"  - [{index}] {result['method']} {result['url']}: {result['error']}")
+            elif result['status_code'] != expected:
+                failures.append(
+                    f"  - [{index}] {result['method']} {result['url']}: got {result['status_code']}"
+                )
+
+        if failures:
+            BuiltIn().fail(
+                f"{len(failures)} of {len(self.last_batch_results)} requests did not return {expected}:\n"
+                + "\n".join(failures)
+            )
+        self._log("All %s batch responses returned %s", len(self.last_batch_results), expected)
+
+    @keyword
+    def run_load_test(self, endpoint, method='GET', duration=10, concurrency=1, rate=None,
+                      ramp_up=0, payloads=None, payload_type='json', expected_status=None,
+                      max_p50=None, max_p95=None, max_p99=None, max_error_rate=None,
+                      min_throughput=None):
+        """Drive an endpoint for a fixed duration and verify latency/error SLOs
+
+        Runs in fixed-concurrency mode by default: `concurrency` workers send requests
+        back to back. When `rate` is given it runs in fixed-rate mode instead: requests
+        are started on an open schedule of `rate` requests per second, using up to
+        `concurrency` workers. Fixed-rate latency is measured from each request's scheduled
+        send time, so time spent queued behind busy workers counts against the SLOs;
+        requests still queued when the duration ends are not sent but counted as dropped,
+        and dropped requests count as errors in the error rate.
+        In both modes the load ramps up linearly over `ramp_up` seconds.
+
+        Args:
+            endpoint: API endpoint
+            method: HTTP method (default: GET)
+            duration: Test duration in seconds, including ramp-up
+            concurrency: Number of concurrent workers
+            rate: Optional target request rate (requests per second)
+            ramp_up: Seconds to ramp from zero to full load
+            payloads: Optional list of payloads (e.g. rows from Excel) sent round-robin
+            payload_type: 'json' or 'xml'
+            expected_status: Status code counted as success (default: any status below 400)
+            max_p50: Optional p50 latency limit in seconds
+            max_p95: Optional p95 latency limit in seconds
+            max_p99: Optional p99 latency limit in seconds
+            max_error_rate: Optional error rate limit (0.0 - 1.0)
+            min_throughput: Optional minimum throughput in requests per second
+
+        Returns:
+            Dictionary with request count, dropped request count, error rate, throughput,
+            latency percentiles (seconds) and a latency histogram
+        """
+        duration = float(duration)
+        concurrency = max(1, int(concurrency))
+        ramp_up = min(float(ramp_up), duration)
+        rate = float(rate) if rate not in (None, '', 'None') else None
+        expected = int(expected_status) if expected_status not in (None, '', 'None') else None
+        if isinstance(payloads, str):
+            payloads = json.loads(payloads)
+        payloads = list(payloads) if payloads else [None]
+
+        url = self._build_url(endpoint)
+        method = method.upper()
+        prepared = []
+        for payload in payloads:
+            if payload is None:
+                prepared.append((None, self.headers))
+            else:
+                prepared.append(self._prepare_request(payload, payload_type))
+
+        latencies = []
+        errors = []
+        dropped = []
+        created = []
+        lock = threading.Lock()
+        counter = itertools.count()
+
+        def send_one(scheduled=None):
+            # Fixed-rate requests are timed from when they should have been sent
+            started = time.perf_counter() if scheduled is None else scheduled
+            if scheduled is not None and time.perf_counter() >= deadline:
+                with lock:
+                    dropped.append(scheduled)
+                return
+            body, req_headers = prepared[next(counter) % len(prepared)]
+            try:
+                response = self._send_request(method, url, data=body, headers=req_headers)
+                if getattr(response, 'created_records', None) is not None:
+                    with lock:
+                        created.append(response.created_records)
+                status = response.status_code
+                ok = status == expected if expected is not None else status < 400
+                error = None if ok else f"HTTP {status}"
+            except Exception as e:
+                error = str(e)
+            latency = time.perf_counter() - started
+            with lock:
+                latencies.append(latency)
+                if error:
+                    errors.append(error)
+
+        self._ensure_pool_size(concurrency)
+        started = time.perf_counter()
+        deadline = started + duration
+
+        if rate is None:
+            def worker(worker_index):
+                # Stagger worker start times to ramp load up linearly
+                start_at = started + ramp_up * worker_index / concurrency
+                time.sleep(max(0.0, start_at - time.perf_counter()))
+                while time.perf_counter() < deadline:
+                    send_one()
+
+            threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(concurrency)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        else:
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                for offset in self._load_schedule(rate, ramp_up, duration):
+                    time.sleep(max(0.0, started + offset - time.perf_counter()))
+                    executor.submit(send_one, started + offset)
+
+        elapsed = time.perf_counter() - started
+        for records in created:
+            self._add_created_records(records)
+        self.last_load_test_results = self._summarize_load_test(
+            method, url, latencies, errors, elapsed, dropped=len(dropped)
+        )
+        results = self.last_load_test_results
+
+        self._log(
+            "Load test %s %s: %s requests in %.2fs, %.1f req/s, error rate %.2f%%, %s dropped",
+            method, url, results['requests'], elapsed, results['throughput'], results['error_rate'] * 100,
+            results['dropped'],
+        )
+        self._log(
+            "Latency p50=%.4fs p95=%.4fs p99=%.4fs max=%.4fs",
+            results['p50'], results['p95'], results['p99'], results['max'],
+        )
+
+        breaches = []
+        for name, limit in (('p50', max_p50), ('p95', max_p95), ('p99', max_p99)):
+            if limit not in (None, '', 'None') and results[name] > float(limit):
+                breaches.append(f"{name} latency {results[name]:.4f}s exceeds {float(limit)}s")
+        if max_error_rate not in (None, '', 'None') and results['error_rate'] > float(max_error_rate):
+            breaches.append(f"Error rate {results['error_rate']:.2%} exceeds {float(max_error_rate):.2%}")
+        if min_throughput not in (None, '', 'None') and results['throughput'] < float(min_throughput):
+            breaches.append(f"Throughput {results['throughput']:.1f} req/s below {float(min_throughput)} req/s")
+        if breaches:
+            BuiltIn().fail("Load test SLO breached:\n" + "\n".join(f"  - {b}" for b in breaches))
+
+        return results
+
+    @keyword
+    def get_load_test_results(self):
+        """Get the summary of the last load test"""
+        return self.last_load_test_results
+
+    @keyword
+    def track_created_records(self, endpoint, table_name, id_key, id_column=None):
+        """Record the ID of every record created by a successful POST to an endpoint
+
+        The IDs are read from the JSON response (an object, or a list of objects)
+        and collected per table, so teardown can delete exactly what the tests
+        created with DatabaseKeywords' Delete Created Records.
+
+        Args:
+            endpoint: Collection endpoint that creates records (e.g. /table/film)
+            table_name: Database table the records are stored in
+            id_key: Key of the ID in the POST response
+            id_column: Database ID column (default: same as id_key)
+        """
+        path = urlparse(self._build_url(endpoint)).path.rstrip('/')
+        self.record_tracking_rules[path] = (table_name, id_key, id_column or id_key)
+        self._log("Tracking records created by POST %s in %s", path, table_name)
+
+    @keyword
+    def stop_tracking_created_records(self):
+        """Stop recording created IDs; the records already tracked are kept"""
+        self.record_tracking_rules = {}
+
+    @keyword
+    def get_created_records(self):
+        """Get the records created since tracking started or was last cleared
+
+        Returns:
+            Dictionary of table name -> {'id_column': ..., 'ids': [...]}, in the order
+            the tables first received a record
+        """
+        with self.created_records_lock:
+            return {
+                table_name: {'id_column': entry['id_column'], 'ids': list(entry['ids'])}
+                for table_name, entry in self.created_records.items()
+            }
+
+    @keyword
+    def clear_created_records(self):
+        """Forget the tracked records, e.g. after they were deleted"""
+        with self.created_records_lock:
+            self.created_records = {}
+
     # Helper methods
     def _build_url(self, endpoint):
         """Build complete URL from base URL and endpoint"""
@@ -299,7 +1796,385 @@ class APIKeywords:
             return f"{self.base_url.rstrip('/')}/{endpoint.lstrip('/')}"
         return endpoint
 
-    def _parse_response_body(self, response):
+    def _prepare_request(self, payload, payload_type, headers=None):
+        """Encode a payload and return it with the request headers for its content type"""
+        payload_type = payload_type.lower()
+        if payload_type == 'json':
+            body = dump_json(payload) if isinstance(payload, (dict, list)) else payload
+        elif payload_type == 'xml':
+            body = payload if isinstance(payload, (str, bytes)) else ET.tostring(payload, encoding='unicode')
+        else:
+            body = payload
+        return body, self._content_headers(payload_type, headers)
+
+    def _content_headers(self, payload_type, headers=None):
+        """Request headers with the Content-Type for payload_type
+
+        Headers derived from the library headers are built once per payload type and
+        reused until the headers change; callers must not modify the returned dict.
+        """
+        if headers:
+            req_headers = dict(headers)
+        else:
+            cached = self._content_headers_cache.get(payload_type)
+            if cached is not None:
+                return cached
+            req_headers = self.headers.copy()
+
+        content_type = CONTENT_TYPES.get(payload_type)
+        if content_type and 'Content-Type' not in req_headers:
+            req_headers['Content-Type'] = content_type
+        if not headers:
+            self._content_headers_cache[payload_type] = req_headers
+        return req_headers
+
+    def _send_request(self, method, url, data=None, headers=None, stream=False):
+        """Send a request through the shared session, guarded by the circuit breaker
+
+        The body is always fetched in streaming mode so that time to first byte
+        and download time can be measured separately; the per-phase timings are
+        attached to the response as `phase_timings`. POST responses also get the
+        records they created as `created_records`, which the caller adds to the
+        ledger with _add_created_records (this may run on a worker thread).
+        """
+        cassette = self.cassette
+        if cassette:
+            response = cassette.replay(method, url, data, headers)
+            if response is not None:
+                return response
+            if not cassette.recording:
+                raise CassetteMissError(f"No recorded interaction matches {method} {url}")
+            # The recording needs the whole body
+            stream = False
+
+        host = urlparse(url).netloc
+        if self.circuit_breaker:
+            self.circuit_breaker.before_request(host)
+
+        _phase_timings.connect = 0.0
+        _phase_timings.tls = 0.0
+        started = time.perf_counter()
+        # Every outcome is recorded, so a half-open trial can never leave the circuit stuck
+        failed = True
+        try:
+            response = self.session.request(
+                method, url, data=data, headers=headers, timeout=self.timeout, stream=True
+            )
+            headers_received = time.perf_counter()
+            if not stream:
+                response.content
+            failed = response.status_code in _CircuitBreaker.FAILURE_STATUSES
+        finally:
+            if self.circuit_breaker:
+                self.circuit_breaker.record(host, failed=failed)
+        finished = time.perf_counter()
+
+        connect = _phase_timings.connect
+        tls = _phase_timings.tls
+        response.phase_timings = {
+            'connect': connect,
+            'tls': tls,
+            'ttfb': max(0.0, headers_received - started - connect - tls),
+            'download': None if stream else finished - headers_received,
+            'total': finished - started,
+        }
+        if cassette:
+            cassette.record(method, url, data, headers, response)
+        response.created_records = None
+        if method == 'POST' and self.record_tracking_rules and not stream:
+            response.created_records = self._created_record_ids(url, response)
+        return response
+
+    def _created_record_ids(self, url, response):
+        """Return (table_name, id_column, ids) for a POST response matching a tracking rule
+
+        ids is None when the response is not JSON. Returns None when no rule matches.
+        Does not log, so it is safe on worker threads.
+        """
+        rule = self.record_tracking_rules.get(urlparse(url).path.rstrip('/'))
+        if rule is None or not 200 <= response.status_code < 300:
+            return None
+        table_name, id_key, id_column = rule
+        try:
+            body = json.loads(response.content)
+        except ValueError:
+            return table_name, id_column, None
+        items = body if isinstance(body, list) else [body]
+        ids = [item[id_key] for item in items if isinstance(item, dict) and item.get(id_key) is not None]
+        return table_name, id_column, ids
+
+    def _add_created_records(self, created):
+        """Add IDs found by _created_record_ids to the created-records ledger (main thread only)"""
+        if created is None:
+            return
+        table_name, id_column, ids = created
+        if ids is None:
+            self._log("Could not track created record: response is not JSON", level='DEBUG')
+            return
+        if not ids:
+            return
+        with self.created_records_lock:
+            entry = self.created_records.setdefault(table_name, {'id_column': id_column, 'ids': []})
+            entry['ids'].extend(ids)
+
+    def _record_request_timing(self, method, endpoint, response, request_body, parse_time):
+        """Build a timing record for a response and append it to the metrics file and summary"""
+        phases = response.phase_timings
+        if isinstance(request_body, str):
+            request_bytes = len(request_body.encode('utf-8'))
+        else:
+            request_bytes = len(request_body) if request_body else 0
+        record = {
+            'timestamp': datetime.now().isoformat(timespec='milliseconds'),
+            'method': method,
+            'endpoint': endpoint,
+            'url': response.url,
+            'status': response.status_code,
+            'request_bytes': request_bytes,
+            'response_bytes': len(response.content) if response._content_consumed else None,
+            'connect': phases['connect'],
+            'tls': phases['tls'],
+            'ttfb': phases['ttfb'],
+            'download': phases['download'],
+            'parse': parse_time,
+            'total': phases['total'] + (parse_time or 0.0),
+        }
+
+        group = f"{method} {_endpoint_shape(endpoint)}"
+        with self.metrics_lock:
+            stats = self.metrics_summary.setdefault(group, {'totals': [], 'phases': {}, 'errors': 0})
+            stats['totals'].append(record['total'])
+            if record['status'] >= 400:
+                stats['errors'] += 1
+            for phase in METRIC_PHASES:
+                if record[phase] is not None:
+                    stats['phases'][phase] = stats['phases'].get(phase, 0.0) + record[phase]
+
+            if self.metrics_file:
+                if self.metrics_format == 'csv':
+                    self.metrics_writer.writerow(record)
+                else:
+                    self.metrics_file.write(json.dumps(record) + '\n')
+        return record
+
+    def _mount_adapters(self):
+        """Mount HTTP adapters using the current pool and retry settings"""
+        adapter = _TimedHTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            max_retries=self.retry_policy if self.retry_policy else 0,
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def _ensure_pool_size(self, size):
+        """Grow the session connection pools so concurrent workers do not discard connections"""
+        if size <= self.pool_maxsize:
+            return
+        self.pool_maxsize = size
+        self._mount_adapters()
+
+    @staticmethod
+    def _to_bool(value):
+        """Interpret Robot Framework string arguments such as 'False' as booleans"""
+        if isinstance(value, str):
+            return value.strip().lower() not in ('false', 'no', 'off', '0', 'none', '')
+        return bool(value)
+
+    def _normalize_request_spec(self, spec):
+        """Turn a request spec (dict or [method, endpoint, payload]) into a dictionary"""
+        if isinstance(spec, (list, tuple)):
+            spec = dict(zip(('method', 'endpoint', 'payload', 'payload_type'), spec))
+        if 'method' not in spec or 'endpoint' not in spec:
+            BuiltIn().fail(f"Request spec must contain 'method' and 'endpoint': {spec}")
+        return {
+            'method': str(spec['method']).upper(),
+            'endpoint': spec['endpoint'],
+            'payload': spec.get('payload'),
+            'payload_type': spec.get('payload_type') or 'json',
+            'headers': spec.get('headers'),
+        }
+
+    def _execute_request_spec(self, spec):
+        """Run one request spec on a worker thread and capture the outcome
+
+        Runs off the main thread, so it must not call BuiltIn keywords; the records
+        a POST created are returned for the caller to add to the ledger.
+
+        Returns:
+            (result dictionary, created records from _created_record_ids or None)
+        """
+        url = self._build_url(spec['endpoint'])
+        if spec['payload'] is not None:
+            request_body, req_headers = self._prepare_request(spec['payload'], spec['payload_type'], spec['headers'])
+        else:
+            request_body, req_headers = None, spec['headers'] or self.headers
+
+        result = {
+            'method': spec['method'],
+            'url': url,
+            'status_code': None,
+            'body': None,
+            'response_time': None,
+            'timing': None,
+            'error': None,
+        }
+        if self.response_cache and spec['method'] in ('POST', 'PUT', 'PATCH', 'DELETE'):
+            self.response_cache.invalidate(url)
+        created = None
+        started = time.perf_counter()
+        try:
+            response = self._send_request(spec['method'], url, data=request_body, headers=req_headers)
+            created = getattr(response, 'created_records', None)
+            result['status_code'] = response.status_code
+            parse_started = time.perf_counter()
+            result['body'] = self._parse_response_body(response, log_errors=False)
+            parse_time = time.perf_counter() - parse_started
+            result['timing'] = self._record_request_timing(
+                spec['method'], spec['endpoint'], response, request_body, parse_time
+            )
+        except Exception as e:
+            result['error'] = str(e)
+        result['response_time'] = time.perf_counter() - started
+        return result, created
+
+    @staticmethod
+    def _load_schedule(rate, ramp_up, duration):
+        """Yield request start offsets (seconds) for a linear ramp to `rate` req/s"""
+        ramp_requests = rate * ramp_up / 2
+        n = 0
+        while True:
+            if n < ramp_requests:
+                # Cumulative requests during the ramp are rate * t^2 / (2 * ramp_up)
+                offset = math.sqrt(2 * n * ramp_up / rate)
+            else:
+                offset = ramp_up + (n - ramp_requests) / rate
+            if offset >= duration:
+                return
+            yield offset
+            n += 1
+
+    @staticmethod
+    def _percentile(sorted_values, percent):
+        """Nearest-rank percentile of an already sorted list"""
+        if not sorted_values:
+            return 0.0
+        rank = max(1, math.ceil(percent / 100 * len(sorted_values)))
+        return sorted_values[rank - 1]
+
+    def _summarize_load_test(self, method, url, latencies, errors, elapsed, dropped=0):
+        """Build the load test summary from raw latencies
+
+        Dropped requests have no latency but count as errors, so a target rate that
+        was never reached fails max_error_rate.
+        """
+        latencies = sorted(latencies)
+        histogram = {}
+        for bound in LATENCY_BUCKETS_MS:
+            histogram[f"<={bound}ms"] = 0
+        histogram[f">{LATENCY_BUCKETS_MS[-1]}ms"] = 0
+        bucket_index = 0
+        for latency in latencies:
+            latency_ms = latency * 1000
+            while bucket_index < len(LATENCY_BUCKETS_MS) and latency_ms > LATENCY_BUCKETS_MS[bucket_index]:
+                bucket_index += 1
+            if bucket_index < len(LATENCY_BUCKETS_MS):
+                histogram[f"<={LATENCY_BUCKETS_MS[bucket_index]}ms"] += 1
+            else:
+                histogram[f">{LATENCY_BUCKETS_MS[-1]}ms"] += 1
+
+        count = len(latencies)
+        error_counts = {}
+        for error in errors:
+            error_counts[error] = error_counts.get(error, 0) + 1
+        if dropped:
+            error_counts['Dropped: not sent before the test ended'] = dropped
+        scheduled = count + dropped
+        failed = len(errors) + dropped
+
+        return {
+            'method': method,
+            'url': url,
+            'requests': count,
+            'dropped': dropped,
+            'errors': failed,
+            'error_rate': failed / scheduled if scheduled else 0.0,
+            'error_types': error_counts,
+            'duration': elapsed,
+            'throughput': count / elapsed if elapsed else 0.0,
+            'min': latencies[0] if latencies else 0.0,
+            'mean': sum(latencies) / count if count else 0.0,
+            'p50': self._percentile(latencies, 50),
+            'p95': self._percentile(latencies, 95),
+            'p99': self._percentile(latencies, 99),
+            'max': latencies[-1] if latencies else 0.0,
+            'histogram': histogram,
+        }
+
+    def _json_path_values(self, path):
+        """Evaluate a JSON path against the last response body"""
+        body = self.last_response_body
+        if not isinstance(body, (dict, list)):
+            BuiltIn().fail("Response body is not JSON")
+        try:
+            return _evaluate_json_path(path, body)
+        except ValueError as e:
+            BuiltIn().fail(str(e))
+
+    def _use_cached_response(self, entry):
+        """Make a cache entry the last response, parsing its body at most once
+
+        The body is deep-copied, so a test changing it never changes later cache hits.
+        """
+        self.last_response = entry['response']
+        self.last_status_code = self.last_response.status_code
+        if entry['body'] is None:
+            entry['body'] = self._parse_response_body(self.last_response)
+        self.last_response_body = copy.deepcopy(entry['body'])
+
+    def _load_response_body(self, response):
+        """Parse the response body now, or defer it in lazy/stream mode"""
+        self._stream_consumed = False
+        self._last_parse_time = None
+        if self.response_parsing_mode == 'eager':
+            started = time.perf_counter()
+            self.last_response_body = self._parse_response_body(response)
+            self._last_parse_time = time.perf_counter() - started
+        else:
+            self._last_response_body = None
+            self._pending_response = response
+
+    def _release_streamed_response(self):
+        """Return the connection of an unread streamed response to the pool"""
+        response = self._pending_response
+        if response is not None and response.raw is not None and not response._content_consumed:
+            self._pending_response = None
+            response.close()
+
+    def _iter_streamed_items(self):
+        """Yield the items of the last response's JSON array one at a time"""
+        response = self._pending_response
+        if response is None or response._content_consumed:
+            # Body already downloaded, so walk the parsed list instead
+            if self.last_response is None:
+                BuiltIn().fail("No response available")
+            if self._stream_consumed:
+                BuiltIn().fail("Streamed response body was already consumed, repeat the request to read it again")
+            body = self.last_response_body
+            if not isinstance(body, list):
+                BuiltIn().fail("Response body is not a JSON array")
+            yield from body
+            return
+        self._pending_response = None
+        self._stream_consumed = True
+        try:
+            yield from _iter_json_array(response.iter_content(chunk_size=STREAM_CHUNK_SIZE))
+        except ValueError as e:
+            BuiltIn().fail(f"Could not stream response body: {str(e)}")
+        finally:
+            response.close()
+
+    def _parse_response_body(self, response, log_errors=True):
         """Parse response body based on content type"""
         try:
             content_type = response.headers.get('Content-Type', '')
@@ -317,25 +2192,19 @@ class APIKeywords:
                 except:
                     return response.text
         except Exception as e:
-            BuiltIn().log(f"Could not parse response body: {str(e)}")
+            if log_errors:
+                self._log("Could not parse response body: %s", e)
             return response.text
 
     def _compare_json(self, actual, expected, path=""):
-        """Recursively compare JSON objects"""
-        if type(actual) != type(expected):
-            BuiltIn().fail(f"Type mismatch at {path}: expected {type(expected).__name__}, got {type(actual).__name__}")
-
-        if isinstance(expected, dict):
-            for key in expected:
-                if key not in actual:
-                    BuiltIn().fail(f"Missing key '{key}' at {path}")
-                self._compare_json(actual[key], expected[key], f"{path}.{key}" if path else key)
-        elif isinstance(expected, list):
-            if len(actual) != len(expected):
-                BuiltIn().fail(f"List length mismatch at {path}: expected {len(expected)}, got {len(actual)}")
-            for i, (a, e) in enumerate(zip(actual, expected)):
-                self._compare_json(a, e, f"{path}[{i}]")
+        """Compare JSON objects with a compiled check, reused for equal expected documents"""
+        if isinstance(expected, str):
+            check = _compile_json_expectation(expected)
+        elif path:
+            check = _compile_json_check(expected, path)
         else:
-            if actual != expected:
-                BuiltIn().fail(f"Value mismatch at {path}: expected {expected}, got {actual}")
+            check = _compile_json_value(expected)
+        error = check(actual)
+        if error:
+            BuiltIn().fail(error)
 
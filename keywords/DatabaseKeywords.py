@@ -3,14 +3,412 @@ Database Keywords Library for Robot Framework
 Supports PostgreSQL operations for test data validation and manipulation
 """
 
+import hashlib
+import itertools
+import json
+import math
+import os
+import queue
+import re
+import select
+import threading
+import time
+import weakref
+from array import array
+from collections import OrderedDict, deque
+
 import psycopg2
-from psycopg2.extras import RealDictCursor
+import psycopg2.errors
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_UNKNOWN
+from psycopg2.extras import RealDictCursor, execute_values
 from robot.api.deco import keyword
 from robot.libraries.BuiltIn import BuiltIn
+try:
+    from ._logging import LoggingPolicy, LogSamplingListener
+except ImportError:
+    from _logging import LoggingPolicy, LogSamplingListener
 from datetime import datetime
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Statements PostgreSQL accepts in PREPARE
+PREPARABLE_STATEMENTS = ("SELECT", "INSERT", "UPDATE", "DELETE", "VALUES", "WITH")
+
+# Number of distinct statements tracked by Get Prepared Statement Stats
+STATEMENT_STATS_SIZE = 1000
+
+# Statement kinds EXPLAIN ANALYZE may re-run without side effects; WITH is left
+# out because its CTEs may modify data, and SELECT ... INTO is excluded separately
+READ_ONLY_STATEMENTS = ("SELECT",)
+_SELECT_INTO = re.compile(r"\bINTO\b", re.IGNORECASE)
+
+# PostgreSQL type OIDs fetched into typed column arrays: int2/int4/int8 and float4/float8/numeric
+INTEGER_TYPE_OIDS = frozenset((20, 21, 23))
+FLOAT_TYPE_OIDS = frozenset((700, 701, 1700))
+
+# Rows fetched per round trip by the streaming query keywords
+STREAM_ITERSIZE = 2000
+
+# Prepared statement names are unique per process so caches never collide on a session
+_STATEMENT_NAMES = itertools.count(1)
+_CURSOR_NAMES = itertools.count(1)
+
+_PLACEHOLDER = re.compile(r"%%|%s|%\(")
+
+_SHAPE_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|%s")
+_SHAPE_LISTS = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)+\s*\)", re.IGNORECASE)
+
+
+def _statement_shape(query):
+    """Normalize a statement so queries differing only in literal values group together"""
+    shape = _SHAPE_LITERALS.sub("?", " ".join(query.split()))
+    return _SHAPE_LISTS.sub("IN (...)", shape)
+
+# Characters escaped in COPY text format
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _to_int(value):
+    if isinstance(value, str):
+        return int(float(value)) if "." in value else int(value)
+    return int(value)
+
+
+def _to_bool(value):
+    if isinstance(value, str):
+        return value.strip().lower() in ("true", "t", "yes", "y", "1")
+    return bool(value)
+
+
+def _to_array(value):
+    """Format a list, or a comma separated string, as a PostgreSQL array literal"""
+    if isinstance(value, str):
+        if value.strip().startswith("{"):
+            return value.strip()
+        value = [item.strip() for item in value.split(",") if item.strip()]
+    items = (
+        "NULL" if item is None
+        else '"' + str(item).replace("\\", "\\\\").replace('"', '\\"') + '"'
+        for item in value
+    )
+    return "{" + ",".join(items) + "}"
+
 
-class DatabaseKeywords:
+# Type coercions applied to seeded values, by type name
+COERCIONS = {
+    "int": _to_int,
+    "float": float,
+    "str": str,
+    "bool": _to_bool,
+    "json": lambda value: value if isinstance(value, str) else json.dumps(value),
+    "array": _to_array,
+}
+
+# Coercion picked for a column from its information_schema data_type
+DATA_TYPE_COERCIONS = {
+    "smallint": "int",
+    "integer": "int",
+    "bigint": "int",
+    "boolean": "bool",
+    "json": "json",
+    "jsonb": "json",
+    "ARRAY": "array",
+}
+
+
+class _ConnectionPool:
+    """Thread-safe pool of psycopg2 connections to a single database
+
+    Idle connections are kept most-recently-used first, checked before being
+    handed out and closed once they sit idle longer than idle_timeout (never
+    shrinking the pool below min_size).
+    """
+
+    def __init__(
+        self, connect_kwargs, min_size=1, max_size=5, idle_timeout=300.0,
+        health_check="SELECT 1", checkout_timeout=30.0,
+    ):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError(
+                f"Invalid pool size: min_size={min_size}, max_size={max_size}"
+            )
+        self.connect_kwargs = connect_kwargs
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.health_check = health_check
+        self.checkout_timeout = checkout_timeout
+        self.idle = deque()
+        self.in_use = 0
+        self.closed = False
+        self.condition = threading.Condition()
+        self.stats = {
+            "created": 0,
+            "reused": 0,
+            "returned": 0,
+            "discarded": 0,
+            "evicted": 0,
+            "health_check_failures": 0,
+            "waits": 0,
+        }
+        for _ in range(min_size):
+            self.idle.append((self._connect(), time.monotonic()))
+
+    def _connect(self):
+        connection = psycopg2.connect(**self.connect_kwargs)
+        self.stats["created"] += 1
+        return connection
+
+    def _is_healthy(self, connection):
+        if connection.closed:
+            return False
+        if not self.health_check:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(self.health_check)
+            connection.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _discard(self, connection):
+        try:
+            connection.close()
+        except psycopg2.Error:
+            pass
+
+    def _evict_idle(self):
+        """Close idle connections past idle_timeout, oldest first (caller holds the lock)"""
+        if self.idle_timeout is None:
+            return
+        now = time.monotonic()
+        while self.idle and len(self.idle) + self.in_use > self.min_size:
+            connection, returned_at = self.idle[-1]
+            if now - returned_at < self.idle_timeout:
+                break
+            self.idle.pop()
+            self._discard(connection)
+            self.stats["evicted"] += 1
+
+    def checkout(self):
+        """Borrow a healthy connection, opening a new one while below max_size"""
+        deadline = time.monotonic() + self.checkout_timeout
+        with self.condition:
+            while True:
+                if self.closed:
+                    raise RuntimeError("Connection pool is closed")
+                self._evict_idle()
+                while self.idle:
+                    connection, _ = self.idle.popleft()
+                    if self._is_healthy(connection):
+                        self.in_use += 1
+                        self.stats["reused"] += 1
+                        return connection
+                    self._discard(connection)
+                    self.stats["health_check_failures"] += 1
+                if self.in_use < self.max_size:
+                    # Reserve the slot, then connect without holding the lock
+                    self.in_use += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(
+                        f"No connection available within {self.checkout_timeout}s "
+                        f"({self.max_size} in use)"
+                    )
+                self.stats["waits"] += 1
+                self.condition.wait(remaining)
+        try:
+            return self._connect()
+        except Exception:
+            with self.condition:
+                self.in_use -= 1
+                self.condition.notify()
+            raise
+
+    def checkin(self, connection):
+        """Return a borrowed connection, rolling back any open transaction"""
+        with self.condition:
+            self.in_use -= 1
+            reusable = not self.closed and not connection.closed
+            if reusable:
+                try:
+                    status = connection.info.transaction_status
+                    if status == TRANSACTION_STATUS_UNKNOWN:
+                        reusable = False
+                    elif status != TRANSACTION_STATUS_IDLE:
+                        connection.rollback()
+                except psycopg2.Error:
+                    reusable = False
+            if reusable:
+                self.idle.appendleft((connection, time.monotonic()))
+                self.stats["returned"] += 1
+                self._evict_idle()
+            else:
+                self._discard(connection)
+                self.stats["discarded"] += 1
+            self.condition.notify()
+
+    def close(self):
+        """Close idle connections; borrowed ones are closed when returned"""
+        with self.condition:
+            self.closed = True
+            while self.idle:
+                self._discard(self.idle.pop()[0])
+            self.condition.notify_all()
+
+    def get_stats(self):
+        with self.condition:
+            return dict(
+                self.stats,
+                idle=len(self.idle),
+                in_use=self.in_use,
+                min_size=self.min_size,
+                max_size=self.max_size,
+            )
+
+
+class _PreparedStatementCache:
+    """LRU of server-side prepared statements on one connection, keyed by query text
+
+    A statement is only prepared once it has been executed prepare_threshold
+    times, so one-off queries never pay for the extra PREPARE round trip.
+    Queries the server refuses to prepare (e.g. a parameter whose type cannot be
+    inferred) are remembered and always run unprepared.
+    """
+
+    def __init__(self, max_size=100, prepare_threshold=2):
+        self.max_size = max_size
+        self.prepare_threshold = prepare_threshold
+        self.statements = OrderedDict()
+        self.seen = OrderedDict()
+        self.unpreparable = set()
+
+    def lookup(self, cursor, query, params):
+        """Return the prepared statement name for query, preparing it when due
+
+        Returns:
+            Statement name, or None when the query should run unprepared
+        """
+        name = self.statements.get(query)
+        if name:
+            self.statements.move_to_end(query)
+            return name
+        if query in self.unpreparable:
+            return None
+        count = self.seen.pop(query, 0) + 1
+        if count < self.prepare_threshold:
+            self.seen[query] = count
+            if len(self.seen) > self.max_size * 10:
+                self.seen.popitem(last=False)
+            return None
+        statement = _positional_statement(query, params)
+        if statement is None:
+            return None
+        name = f"rf_stmt_{next(_STATEMENT_NAMES)}"
+        # A failed PREPARE must not abort the caller's transaction
+        in_transaction = not cursor.connection.autocommit
+        if in_transaction:
+            cursor.execute("SAVEPOINT rf_prepare")
+        try:
+            cursor.execute(f"PREPARE {name} AS {statement}")
+        except psycopg2.Error:
+            if in_transaction:
+                cursor.execute("ROLLBACK TO SAVEPOINT rf_prepare")
+                cursor.execute("RELEASE SAVEPOINT rf_prepare")
+            if len(self.unpreparable) >= self.max_size * 10:
+                self.unpreparable.clear()
+            self.unpreparable.add(query)
+            return None
+        if in_transaction:
+            cursor.execute("RELEASE SAVEPOINT rf_prepare")
+        if len(self.statements) >= self.max_size:
+            old_query, old_name = next(iter(self.statements.items()))
+            cursor.execute(f"DEALLOCATE {old_name}")
+            del self.statements[old_query]
+        self.statements[query] = name
+        return name
+
+    def forget(self, query):
+        self.statements.pop(query, None)
+
+
+class _CopyStream:
+    """File-like object feeding COPY FROM STDIN from an iterator of text chunks"""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.chunk = ""
+        self.offset = 0
+
+    def read(self, size=-1):
+        while self.offset >= len(self.chunk):
+            self.chunk = next(self.chunks, None)
+            self.offset = 0
+            if self.chunk is None:
+                self.chunk = ""
+                return ""
+        if size is None or size < 0:
+            end = len(self.chunk)
+        else:
+            end = self.offset + size
+        data = self.chunk[self.offset : end]
+        self.offset += len(data)
+        return data
+
+
+def _positional_statement(query, params):
+    """Rewrite a %s-style query as a PREPARE body with $1..$n placeholders
+
+    Returns:
+        The rewritten statement, or None when the query cannot be prepared
+        (not a single SELECT/INSERT/UPDATE/DELETE, named placeholders, or a
+        placeholder count that does not match params)
+    """
+    stripped = query.strip().rstrip(";")
+    words = stripped.split(None, 1)
+    if not words or words[0].upper() not in PREPARABLE_STATEMENTS or ";" in stripped:
+        return None
+    if not params:
+        return stripped
+    positions = []
+
+    def substitute(match):
+        token = match.group(0)
+        if token == "%%":
+            return "%"
+        if token == "%(":
+            raise ValueError("named placeholder")
+        positions.append(len(positions) + 1)
+        return f"${len(positions)}"
+
+    try:
+        statement = _PLACEHOLDER.sub(substitute, stripped)
+    except ValueError:
+        return None
+    if len(positions) != len(params):
+        return None
+    return statement
+
+
+class _QueryReportListener:
+    """Library listener rewriting the slow query report when a suite ends"""
+
+    ROBOT_LISTENER_API_VERSION = 3
+
+    def __init__(self, library):
+        self.library = library
+
+    def end_suite(self, data, result):
+        if self.library.slow_query_report_path and self.library.query_timings:
+            self.library._write_slow_query_report(self.library.slow_query_report_path)
+
+
+class DatabaseKeywords(LoggingPolicy):
     ROBOT_LIBRARY_SCOPE = "GLOBAL"
 
     def __init__(self):
@@ -22,6 +420,250 @@ class DatabaseKeywords:
         self.db_user = None
         self.db_password = None
         self.last_query_result = None
+        self.pool_settings = None
+        self.connection_pools = {}
+        self.connection_pool = None
+        self.prepared_statement_settings = None
+        self.prepared_caches = weakref.WeakKeyDictionary()
+        self.statement_stats = OrderedDict()
+        self.table_snapshots = {}
+        self.isolation_savepoints = []
+        self.connect_kwargs = None
+        self.notification_channels = {}
+        self.listen_connection = None
+        self.listened_channels = set()
+        self._init_logging_policy()
+        self.verification_queue = None
+        self.verification_workers = []
+        self.verification_connections = []
+        self.verification_lock = threading.Lock()
+        self.verification_mismatches = []
+        self.verified_count = 0
+        self.column_data = {}
+        self.column_nulls = {}
+        self.query_timings = OrderedDict()
+        self.query_timings_lock = threading.Lock()
+        self.last_statement_time = None
+        self.slow_query_threshold = None
+        self.slow_query_top_n = 20
+        self.slow_query_report_path = None
+        self.ROBOT_LIBRARY_LISTENER = [LogSamplingListener(self), _QueryReportListener(self)]
+
+    @keyword
+    def set_database_logging_policy(self, level="INFO", max_length=None, sample_every=1):
+        """Control how much DatabaseKeywords logs
+
+        Args:
+            level: Minimum level logged: TRACE, DEBUG, INFO (default), WARN or NONE
+            max_length: Truncate each logged message to this many characters (default: no limit)
+            sample_every: Inside FOR/WHILE loops, log only 1 in N iterations (default: every iteration)
+        """
+        self._set_logging_policy(level, max_length, sample_every)
+
+    @keyword
+    def enable_connection_pooling(
+        self, min_size=1, max_size=5, idle_timeout=300, health_check="SELECT 1",
+        checkout_timeout=30,
+    ):
+        """Make Connect/Disconnect From Database borrow and return pooled connections
+
+        One pool is kept per host/port/database/user and is created on the first
+        connect. Returned connections are rolled back, so uncommitted work is
+        discarded exactly as when the connection used to be closed.
+
+        Args:
+            min_size: Connections kept open even when idle (default: 1)
+            max_size: Upper bound on open connections per pool (default: 5)
+            idle_timeout: Close idle connections above min_size after this many seconds (default: 300)
+            health_check: Query run on checkout to validate a connection, empty to only check it is open (default: SELECT 1)
+            checkout_timeout: Seconds to wait for a free connection when the pool is exhausted (default: 30)
+        """
+        min_size = int(min_size)
+        max_size = int(max_size)
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            BuiltIn().fail(
+                f"Invalid pool size: min_size={min_size}, max_size={max_size}"
+            )
+        self.pool_settings = {
+            "min_size": min_size,
+            "max_size": max_size,
+            "idle_timeout": (
+                float(idle_timeout) if idle_timeout not in (None, "", "None") else None
+            ),
+            "health_check": health_check if health_check not in (None, "None") else "",
+            "checkout_timeout": float(checkout_timeout),
+        }
+        for pool in self.connection_pools.values():
+            pool.close()
+        self.connection_pools = {}
+        self._log("Connection pooling enabled: %s", self.pool_settings)
+
+    @keyword
+    def close_connection_pools(self):
+        """Close all pooled connections and go back to one connection per connect"""
+        for pool in self.connection_pools.values():
+            pool.close()
+        self.connection_pools = {}
+        self.pool_settings = None
+        self._log("Connection pools closed")
+
+    @keyword
+    def get_connection_pool_stats(self):
+        """Get counters for every connection pool
+
+        Returns:
+            Dictionary keyed by 'user@host:port/database' with created, reused, returned,
+            discarded, evicted, health_check_failures, waits, idle and in_use counts
+        """
+        return {
+            f"{user}@{host}:{port}/{database}": pool.get_stats()
+            for (host, port, database, user), pool in self.connection_pools.items()
+        }
+
+    @keyword
+    def enable_prepared_statements(self, cache_size=100, prepare_threshold=2):
+        """Run repeated statements through server-side prepared statements
+
+        Each connection keeps an LRU of prepared statements keyed by query text;
+        a query is prepared once it has been executed prepare_threshold times and
+        then runs as EXECUTE with its parameters bound, reusing the server's plan.
+        Only single SELECT/INSERT/UPDATE/DELETE/VALUES/WITH statements are prepared.
+
+        Args:
+            cache_size: Prepared statements kept per connection (default: 100)
+            prepare_threshold: Executions of the same query before it is prepared (default: 2)
+        """
+        cache_size = int(cache_size)
+        prepare_threshold = int(prepare_threshold)
+        if cache_size < 1 or prepare_threshold < 1:
+            BuiltIn().fail(
+                f"Invalid prepared statement settings: cache_size={cache_size}, "
+                f"prepare_threshold={prepare_threshold}"
+            )
+        self.prepared_statement_settings = {
+            "max_size": cache_size,
+            "prepare_threshold": prepare_threshold,
+        }
+        self.prepared_caches = weakref.WeakKeyDictionary()
+        self._log("Prepared statements enabled: %s", self.prepared_statement_settings)
+
+    @keyword
+    def disable_prepared_statements(self):
+        """Stop preparing statements; existing ones are released when their connection closes"""
+        self.prepared_statement_settings = None
+        self.prepared_caches = weakref.WeakKeyDictionary()
+
+    @keyword
+    def enable_slow_query_capture(self, threshold=0.5, top_n=20, report_file=None):
+        """Capture query plans of slow statements and report the slowest statement shapes
+
+        Every statement is timed; statements are grouped by shape (literals and
+        bound values replaced by ?). When a statement takes longer than threshold,
+        its plan is captured: EXPLAIN (ANALYZE, BUFFERS) for reads, plain EXPLAIN
+        for writes so they are not executed twice. The report of the top_n shapes
+        by total time is rewritten whenever a suite ends.
+
+        Args:
+            threshold: Seconds after which a statement counts as slow (default: 0.5)
+            top_n: Statement shapes included in the report (default: 20)
+            report_file: Report path (default: slow_queries.txt in the output directory,
+                next to output.xml)
+        """
+        self.slow_query_threshold = float(threshold)
+        self.slow_query_top_n = int(top_n)
+        if not report_file:
+            output_dir = BuiltIn().get_variable_value("${OUTPUT DIR}", os.getcwd())
+            report_file = os.path.join(output_dir, "slow_queries.txt")
+        self.slow_query_report_path = report_file
+        self._log(
+            "Slow query capture enabled: threshold %ss, report %s", threshold, report_file
+        )
+
+    @keyword
+    def disable_slow_query_capture(self):
+        """Stop capturing plans and writing the slow query report; timing continues"""
+        self.slow_query_threshold = None
+        self.slow_query_report_path = None
+
+    @keyword
+    def get_query_timings(self, top_n=None):
+        """Get per-shape statement timings, slowest total first
+
+        Args:
+            top_n: Only return this many shapes (default: all)
+
+        Returns:
+            List of dictionaries with shape, count, total, mean, max, slow_count,
+            slowest_query and plan (the captured EXPLAIN output, if any)
+        """
+        with self.query_timings_lock:
+            entries = [dict(stats, shape=shape) for shape, stats in self.query_timings.items()]
+        timings = sorted(
+            (dict(entry, mean=entry["total"] / entry["count"]) for entry in entries),
+            key=lambda entry: entry["total"],
+            reverse=True,
+        )
+        return timings[: int(top_n)] if top_n not in (None, "", "None") else timings
+
+    @keyword
+    def get_last_statement_time(self):
+        """Get the duration in seconds of the last statement run by a DatabaseKeywords keyword"""
+        return self.last_statement_time
+
+    @keyword
+    def write_slow_query_report(self, report_file=None):
+        """Write the slow query report now
+
+        Args:
+            report_file: Report path (default: the one set by Enable Slow Query Capture,
+                else slow_queries.txt in the output directory)
+
+        Returns:
+            Path of the written report
+        """
+        report_file = report_file or self.slow_query_report_path or os.path.join(
+            BuiltIn().get_variable_value("${OUTPUT DIR}", os.getcwd()), "slow_queries.txt"
+        )
+        self._write_slow_query_report(report_file)
+        self._log("Slow query report written to %s", report_file)
+        return report_file
+
+    @keyword
+    def reset_query_timings(self):
+        """Clear all recorded statement timings and captured plans"""
+        with self.query_timings_lock:
+            self.query_timings = OrderedDict()
+
+    @keyword
+    def get_prepared_statement_stats(self):
+        """Get per-statement execution counts and plan reuse
+
+        Returns:
+            List of dictionaries, most recently used last, with statement, executions,
+            prepared_executions (executions served by a prepared statement) and, for
+            statements prepared on the current connection, generic_plans and custom_plans
+            as reported by pg_prepared_statements (PostgreSQL 14+)
+        """
+        plans = {}
+        cache = self.prepared_caches.get(self.connection) if self.connection else None
+        if cache and cache.statements:
+            with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
+                cursor.execute("SELECT * FROM pg_prepared_statements")
+                plans = {row["name"]: row for row in cursor.fetchall()}
+        stats = []
+        for query, counts in self.statement_stats.items():
+            entry = dict(counts, statement=query)
+            plan = plans.get(cache.statements.get(query)) if plans else None
+            if plan:
+                entry["generic_plans"] = plan.get("generic_plans")
+                entry["custom_plans"] = plan.get("custom_plans")
+            stats.append(entry)
+        return stats
+
+    @keyword
+    def reset_prepared_statement_stats(self):
+        """Clear the counters reported by Get Prepared Statement Stats"""
+        self.statement_stats = OrderedDict()
 
     @keyword
     def connect_to_database(self, db_host, db_name, db_user, db_password, db_port=5432):
@@ -34,23 +676,41 @@ class DatabaseKeywords:
             db_password: Database password
             db_port: Database port (default: 5432)
         """
+        if self.isolation_savepoints:
+            # The isolated transaction lives on the current connection
+            if (db_host, db_name, db_user, db_password, int(db_port)) != (
+                self.db_host, self.db_name, self.db_user, self.db_password, self.db_port
+            ):
+                BuiltIn().fail("Cannot switch databases while test isolation is active")
+            self._log("Reusing the isolated connection to %s", self.db_name)
+            return
+
         self.db_host = db_host
         self.db_name = db_name
         self.db_user = db_user
         self.db_password = db_password
         self.db_port = int(db_port)
 
+        connect_kwargs = {
+            "host": self.db_host,
+            "database": self.db_name,
+            "user": self.db_user,
+            "password": self.db_password,
+            "port": self.db_port,
+        }
+        self.connect_kwargs = connect_kwargs
         try:
-            self.connection = psycopg2.connect(
-                host=self.db_host,
-                database=self.db_name,
-                user=self.db_user,
-                password=self.db_password,
-                port=self.db_port,
-            )
+            if self.connection_pool and self.connection:
+                # Connecting again without disconnecting: hand back the old one
+                self.disconnect_from_database()
+            if self.pool_settings is not None:
+                self.connection_pool = self._get_connection_pool(connect_kwargs)
+                self.connection = self.connection_pool.checkout()
+            else:
+                self.connection = psycopg2.connect(**connect_kwargs)
             self.cursor = self.connection.cursor(cursor_factory=RealDictCursor)
-            BuiltIn().log(
-                f"Connected to database: {self.db_name} on {self.db_host}:{self.db_port}"
+            self._log(
+                "Connected to database: %s on %s:%s", self.db_name, self.db_host, self.db_port
             )
         except Exception as e:
             BuiltIn().fail(f"Failed to connect to database: {str(e)}")
@@ -58,21 +718,102 @@ class DatabaseKeywords:
     @keyword
     def disconnect_from_database(self):
         """Disconnect from database"""
+        if self.isolation_savepoints:
+            self._log("Connection kept open until End Test Isolation")
+            return
         try:
             if self.cursor:
                 self.cursor.close()
-            if self.connection:
+            if self.connection_pool and self.connection:
+                self.connection_pool.checkin(self.connection)
+                self._log("Returned connection to pool")
+            elif self.connection:
                 self.connection.close()
-            BuiltIn().log("Disconnected from database")
+                self._log("Disconnected from database")
+            self.cursor = None
+            self.connection = None
+            self.connection_pool = None
         except Exception as e:
             BuiltIn().fail(f"Failed to disconnect from database: {str(e)}")
 
     @keyword
-    def execute_query(self, query):
+    def start_test_isolation(self):
+        """Run the following database changes in a transaction that End Test Isolation rolls back
+
+        Commits made by the other keywords are suppressed while isolation is active,
+        and Disconnect/Connect To Database keep using the same connection. Calling
+        it again while active nests a savepoint, which End Test Isolation rolls
+        back on its own. A failing statement rolls the transaction back to the
+        start of the innermost isolation level. Typically used as test setup and
+        teardown.
+        """
+        if not self.connection:
+            BuiltIn().fail("Not connected to database")
+        try:
+            if not self.isolation_savepoints:
+                self.connection.commit()
+            name = f"rf_isolation_{len(self.isolation_savepoints) + 1}"
+            self.cursor.execute(f"SAVEPOINT {name}")
+        except Exception as e:
+            BuiltIn().fail(f"Failed to start test isolation: {str(e)}")
+        self.isolation_savepoints.append(name)
+        self._log("Test isolation started (level %s)", len(self.isolation_savepoints))
+
+    @keyword
+    def end_test_isolation(self):
+        """Roll back every database change made since the matching Start Test Isolation"""
+        if not self.isolation_savepoints:
+            self._log("No test isolation active", level="WARN")
+            return
+        name = self.isolation_savepoints.pop()
+        try:
+            if self.isolation_savepoints:
+                self.cursor.execute(f"ROLLBACK TO SAVEPOINT {name}")
+                self.cursor.execute(f"RELEASE SAVEPOINT {name}")
+            else:
+                self.connection.rollback()
+        except Exception as e:
+            BuiltIn().fail(f"Failed to end test isolation: {str(e)}")
+        self._log("Test isolation rolled back (level %s)", len(self.isolation_savepoints) + 1)
+
+    @keyword
+    def delete_created_records(self, created_records):
+        """Delete records tracked by APIKeywords' Track Created Records
+
+        Each table is cleaned with a single DELETE ... WHERE id = ANY(...), tables
+        in reverse order of creation so dependent records go first.
+
+        Args:
+            created_records: Dictionary from Get Created Records
+
+        Returns:
+            Number of rows deleted
+        """
+        if not self.connection:
+            BuiltIn().fail("Not connected to database")
+        deleted = 0
+        try:
+            for table_name, entry in reversed(list(created_records.items())):
+                ids = entry["ids"]
+                if not ids:
+                    continue
+                query = f"DELETE FROM {table_name} WHERE {entry['id_column']} = ANY(%s)"
+                self._execute(query, ([self._id_param(v) for v in ids],))
+                deleted += self.cursor.rowcount
+                self._log("Deleted %s created records from %s", self.cursor.rowcount, table_name)
+            self._commit()
+        except Exception as e:
+            self._rollback()
+            BuiltIn().fail(f"Failed to delete created records: {str(e)}")
+        return deleted
+
+    @keyword
+    def execute_query(self, query, *params):
         """Execute SELECT query and return results
 
         Args:
-            query: SQL SELECT query
+            query: SQL SELECT query, with %s placeholders for bound parameters
+            *params: Values bound to the %s placeholders, in order
 
         Returns:
             List of result rows (as dictionaries)
@@ -81,20 +822,21 @@ class DatabaseKeywords:
             BuiltIn().fail("Not connected to database")
 
         try:
-            self.cursor.execute(query)
+            self._execute(query, params)
             self.last_query_result = self.cursor.fetchall()
-            BuiltIn().log(f"Query executed: {query}")
-            BuiltIn().log(f"Rows returned: {len(self.last_query_result)}")
+            self._log("Query executed in %.3fs: %s", self.last_statement_time, query)
+            self._log("Rows returned: %s", len(self.last_query_result))
             return self.last_query_result
         except Exception as e:
             BuiltIn().fail(f"Query execution failed: {str(e)}")
 
     @keyword
-    def execute_update(self, query):
+    def execute_update(self, query, *params):
         """Execute INSERT, UPDATE, or DELETE query
 
         Args:
-            query: SQL INSERT/UPDATE/DELETE query
+            query: SQL INSERT/UPDATE/DELETE query, with %s placeholders for bound parameters
+            *params: Values bound to the %s placeholders, in order
 
         Returns:
             Number of rows affected
@@ -103,95 +845,562 @@ class DatabaseKeywords:
             BuiltIn().fail("Not connected to database")
 
         try:
-            self.cursor.execute(query)
-            self.connection.commit()
+            self._execute(query, params)
+            self._commit()
             rows_affected = self.cursor.rowcount
-            BuiltIn().log(f"Update executed: {query}")
-            BuiltIn().log(f"Rows affected: {rows_affected}")
+            self._log("Update executed in %.3fs: %s", self.last_statement_time, query)
+            self._log("Rows affected: %s", rows_affected)
             return rows_affected
         except Exception as e:
-            self.connection.rollback()
+            self._rollback()
             BuiltIn().fail(f"Update execution failed: {str(e)}")
 
     @keyword
-    def table_row_should_exist(self, table_name, where_clause):
+    def get_streamed_query_row_count(self, query, *params, itersize=STREAM_ITERSIZE):
+        """Count the rows of a query through a server-side cursor
+
+        Rows are fetched itersize at a time and never held all at once, so this
+        works on tables of any size.
+
+        Args:
+            query: SQL SELECT query, with %s placeholders for bound parameters
+            *params: Values bound to the %s placeholders, in order
+            itersize: Rows fetched per round trip (default: 2000)
+
+        Returns:
+            Number of rows
+        """
+        count = 0
+        for _, rows in self._stream_query(query, params, itersize):
+            count += len(rows)
+        self._log("Streamed %s rows: %s", count, query)
+        return count
+
+    @keyword
+    def get_streamed_query_checksum(self, query, *params, itersize=STREAM_ITERSIZE):
+        """Compute an order-independent checksum of a query result via a server-side cursor
+
+        Each row is hashed from the string form of its values and the hashes are
+        summed, so two results with the same rows in any order give the same checksum.
+
+        Args:
+            query: SQL SELECT query, with %s placeholders for bound parameters
+            *params: Values bound to the %s placeholders, in order
+            itersize: Rows fetched per round trip (default: 2000)
+
+        Returns:
+            Dictionary with checksum (hex string) and row_count
+        """
+        total = 0
+        count = 0
+        for _, rows in self._stream_query(query, params, itersize):
+            for row in rows:
+                digest = hashlib.blake2b(
+                    "\x1f".join(map(str, row)).encode(), digest_size=8
+                ).digest()
+                total += int.from_bytes(digest, "big")
+            count += len(rows)
+        checksum = format(total % (1 << 64), "016x")
+        self._log("Checksum of %s rows: %s", count, checksum)
+        return {"checksum": checksum, "row_count": count}
+
+    @keyword
+    def get_streamed_query_count_by(
+        self, query, column_name, *params, itersize=STREAM_ITERSIZE
+    ):
+        """Count the rows of a query per value of one column via a server-side cursor
+
+        Args:
+            query: SQL SELECT query, with %s placeholders for bound parameters
+            column_name: Column whose values are counted
+            *params: Values bound to the %s placeholders, in order
+            itersize: Rows fetched per round trip (default: 2000)
+
+        Returns:
+            Dictionary mapping each column value to its number of rows
+        """
+        counts = {}
+        index = None
+        for description, rows in self._stream_query(query, params, itersize):
+            if index is None:
+                columns = [column.name for column in description]
+                if column_name not in columns:
+                    BuiltIn().fail(f"Column '{column_name}' not in query result {columns}")
+                index = columns.index(column_name)
+            for row in rows:
+                value = row[index]
+                counts[value] = counts.get(value, 0) + 1
+        self._log("Counts by %s: %s", column_name, counts)
+        return counts
+
+    @keyword
+    def streamed_query_rows_should_all_match(
+        self, query, condition, *params, itersize=STREAM_ITERSIZE, max_reported=10
+    ):
+        """Verify that every row of a query satisfies a Python condition, via a server-side cursor
+
+        The condition is evaluated once per row with the row's columns as variables,
+        e.g. 'rental_rate > 0 and length is not None'. All rows are checked; the
+        keyword then fails with the number of failing rows and the first few of them.
+
+        Args:
+            query: SQL SELECT query, with %s placeholders for bound parameters
+            condition: Python expression evaluated against each row
+            *params: Values bound to the %s placeholders, in order
+            itersize: Rows fetched per round trip (default: 2000)
+            max_reported: Failing rows included in the failure message (default: 10)
+
+        Returns:
+            Number of rows checked
+        """
+        try:
+            code = compile(condition, "<condition>", "eval")
+        except SyntaxError as e:
+            BuiltIn().fail(f"Invalid condition '{condition}': {str(e)}")
+        max_reported = int(max_reported)
+        count = 0
+        failures = 0
+        reported = []
+        columns = None
+        for description, rows in self._stream_query(query, params, itersize):
+            if columns is None:
+                columns = [column.name for column in description]
+            for row in rows:
+                values = dict(zip(columns, row))
+                try:
+                    matched = eval(code, {}, values)
+                except Exception as e:
+                    matched = False
+                    values = dict(values, error=str(e))
+                if not matched:
+                    failures += 1
+                    if len(reported) < max_reported:
+                        reported.append(values)
+            count += len(rows)
+
+        if failures:
+            error_msg = (
+                f"{failures} of {count} rows do not match '{condition}'. "
+                f"First {len(reported)}:\n"
+            )
+            error_msg += "\n".join(str(values) for values in reported)
+            BuiltIn().fail(error_msg)
+        self._log("All %s rows match '%s'", count, condition)
+        return count
+
+    def _stream_query(self, query, params, itersize):
+        """Yield (cursor description, batch of row tuples) from a named server-side cursor"""
+        if not self.connection:
+            BuiltIn().fail("Not connected to database")
+        itersize = int(itersize)
+        cursor = self.connection.cursor(name=f"rf_stream_{next(_CURSOR_NAMES)}")
+        cursor.itersize = itersize
+        try:
+            # Only time spent in the database counts, not the consumer's work
+            started = time.perf_counter()
+            cursor.execute(query, params or None)
+            elapsed = time.perf_counter() - started
+            while True:
+                started = time.perf_counter()
+                rows = cursor.fetchmany(itersize)
+                elapsed += time.perf_counter() - started
+                if not rows:
+                    break
+                yield cursor.description, rows
+            cursor.close()
+            self._record_statement_time(query, params, elapsed)
+        except psycopg2.Error as e:
+            self._rollback()
+            BuiltIn().fail(f"Streaming query failed: {str(e)}")
+        finally:
+            if not cursor.closed:
+                try:
+                    cursor.close()
+                except psycopg2.Error:
+                    pass
+
+    @keyword
+    def fetch_query_columns(self, query, *params, itersize=STREAM_ITERSIZE):
+        """Fetch a query result as one array per column for the column assertion keywords
+
+        Rows are read in batches through a server-side cursor and appended to
+        typed arrays: integer columns as int64 and float/numeric columns as float64
+        (NumPy arrays when NumPy is installed, array.array otherwise); other
+        columns are kept as lists. NULLs are counted per column and left out of
+        the values.
+
+        Args:
+            query: SQL SELECT query, with %s placeholders for bound parameters
+            *params: Values bound to the %s placeholders, in order
+            itersize: Rows fetched per round trip (default: 2000)
+
+        Returns:
+            Dictionary mapping column names to their arrays of non-NULL values
+        """
+        data = None
+        nulls = None
+        for description, rows in self._stream_query(query, params, itersize):
+            if data is None:
+                columns = [column.name for column in description]
+                data = {}
+                for column in description:
+                    if column.type_code in INTEGER_TYPE_OIDS:
+                        data[column.name] = array("q")
+                    elif column.type_code in FLOAT_TYPE_OIDS:
+                        data[column.name] = array("d")
+                    else:
+                        data[column.name] = []
+                nulls = dict.fromkeys(columns, 0)
+            for name, values in zip(columns, zip(*rows)):
+                present = [value for value in values if value is not None]
+                nulls[name] += len(values) - len(present)
+                target = data[name]
+                if isinstance(target, array) and target.typecode == "d":
+                    target.extend(map(float, present))
+                else:
+                    target.extend(present)
+        if data is None:
+            data, nulls = {}, {}
+        if numpy is not None:
+            data = {
+                name: numpy.frombuffer(values, dtype=numpy.int64 if values.typecode == "q" else numpy.float64)
+                if isinstance(values, array) else values
+                for name, values in data.items()
+            }
+        self.column_data = data
+        self.column_nulls = nulls
+        self._log(
+            "Fetched %s columns: %s",
+            len(data), {name: len(values) + nulls[name] for name, values in data.items()},
+        )
+        return data
+
+    @keyword
+    def column_values_should_be_between(self, column_name, minimum, maximum):
+        """Verify that every non-NULL value of a fetched column is within [minimum, maximum]
+
+        Args:
+            column_name: Column fetched by Fetch Query Columns
+            minimum: Lowest allowed value
+            maximum: Highest allowed value
+        """
+        values = self._numeric_column(column_name)
+        if not len(values):
+            return
+        minimum, maximum = float(minimum), float(maximum)
+        if numpy is not None:
+            actual_min, actual_max = values.min(), values.max()
+            outside = int(numpy.count_nonzero((values < minimum) | (values > maximum)))
+        else:
+            actual_min, actual_max = min(values), max(values)
+            outside = sum(1 for value in values if value < minimum or value > maximum)
+        if outside:
+            BuiltIn().fail(
+                f"{outside} values of {column_name} outside [{minimum}, {maximum}] "
+                f"(min {actual_min}, max {actual_max})"
+            )
+        self._log("All %s values of %s within [%s, %s]", len(values), column_name, minimum, maximum)
+
+    @keyword
+    def column_values_should_be_unique(self, column_name):
+        """Verify that a fetched column has no duplicate non-NULL values"""
+        values = self._column(column_name)
+        if numpy is not None and not isinstance(values, list):
+            unique, counts = numpy.unique(values, return_counts=True)
+            duplicates = unique[counts > 1].tolist()
+        else:
+            seen = set()
+            duplicates = {value for value in values if value in seen or seen.add(value)}
+        if len(duplicates):
+            duplicates = sorted(duplicates, key=str)
+            BuiltIn().fail(
+                f"{len(duplicates)} duplicate values in {column_name}: {duplicates[:10]}"
+            )
+        self._log("All %s values of %s are unique", len(values), column_name)
+
+    @keyword
+    def column_null_count_should_be(self, column_name, expected_count):
+        """Verify the number of NULLs in a fetched column"""
+        self._column(column_name)
+        actual_count = self.column_nulls[column_name]
+        if actual_count != int(expected_count):
+            BuiltIn().fail(
+                f"Expected {expected_count} NULLs in {column_name}, but found {actual_count}"
+            )
+        self._log("%s has %s NULLs", column_name, actual_count)
+
+    @keyword
+    def column_sum_should_be(self, column_name, expected_sum, tolerance=0):
+        """Verify the sum of a fetched numeric column, within an absolute tolerance"""
+        values = self._numeric_column(column_name)
+        actual_sum = float(values.sum()) if numpy is not None else math.fsum(values)
+        self._check_tolerance(f"Sum of {column_name}", actual_sum, expected_sum, tolerance)
+
+    @keyword
+    def column_mean_should_be(self, column_name, expected_mean, tolerance=0):
+        """Verify the mean of a fetched numeric column, within an absolute tolerance"""
+        values = self._numeric_column(column_name)
+        if not len(values):
+            BuiltIn().fail(f"Column {column_name} has no non-NULL values")
+        if numpy is not None:
+            actual_mean = float(values.mean())
+        else:
+            actual_mean = math.fsum(values) / len(values)
+        self._check_tolerance(f"Mean of {column_name}", actual_mean, expected_mean, tolerance)
+
+    @keyword
+    def column_values_should_be_in(self, column_name, *allowed_values):
+        """Verify that every non-NULL value of a fetched column is one of allowed_values"""
+        values = self._column(column_name)
+        numeric = not isinstance(values, list)
+        allowed = [float(value) if numeric else value for value in allowed_values]
+        if numeric and numpy is not None:
+            unexpected = set(values[~numpy.isin(values, allowed)].tolist())
+        else:
+            allowed = set(allowed) | {str(value) for value in allowed}
+            unexpected = {
+                value for value in values if value not in allowed and str(value) not in allowed
+            }
+        if unexpected:
+            unexpected = sorted(unexpected, key=str)
+            BuiltIn().fail(
+                f"{len(unexpected)} unexpected values in {column_name}: {unexpected[:10]}"
+            )
+        self._log("All values of %s in %s", column_name, list(allowed_values))
+
+    def _column(self, column_name):
+        if column_name not in self.column_data:
+            BuiltIn().fail(
+                f"Column '{column_name}' not fetched, available: {list(self.column_data)}"
+            )
+        return self.column_data[column_name]
+
+    def _numeric_column(self, column_name):
+        values = self._column(column_name)
+        if isinstance(values, list):
+            BuiltIn().fail(f"Column '{column_name}' is not numeric")
+        return values
+
+    def _check_tolerance(self, label, actual, expected, tolerance):
+        expected, tolerance = float(expected), float(tolerance)
+        if abs(actual - expected) > tolerance:
+            BuiltIn().fail(f"{label}: expected {expected} ± {tolerance}, but got {actual}")
+        self._log("%s = %s (expected %s ± %s)", label, actual, expected, tolerance)
+
+    @keyword
+    def table_row_should_exist(self, table_name, where_clause, *params):
         """Verify that a row exists in the table
 
         Args:
             table_name: Name of the table
-            where_clause: WHERE clause conditions (e.g., 'id = 5 AND name = "test"')
+            where_clause: WHERE clause conditions (e.g., 'id = 5 AND name = "test"' or 'id = %s')
+            *params: Values bound to %s placeholders in where_clause
         """
         query = f"SELECT COUNT(*) as count FROM {table_name} WHERE {where_clause}"
-        result = self.execute_query(query)
+        result = self.execute_query(query, *params)
 
         if result and result[0]["count"] > 0:
-            BuiltIn().log(f"Row exists in {table_name} where {where_clause}")
+            self._log("Row exists in %s where %s", table_name, where_clause)
         else:
             BuiltIn().fail(f"No row found in {table_name} where {where_clause}")
 
     @keyword
-    def table_row_should_not_exist(self, table_name, where_clause):
+    def table_row_should_not_exist(self, table_name, where_clause, *params):
         """Verify that a row does NOT exist in the table
 
         Args:
             table_name: Name of the table
             where_clause: WHERE clause conditions
+            *params: Values bound to %s placeholders in where_clause
         """
         query = f"SELECT COUNT(*) as count FROM {table_name} WHERE {where_clause}"
-        result = self.execute_query(query)
+        result = self.execute_query(query, *params)
 
         if result and result[0]["count"] == 0:
-            BuiltIn().log(f"Row does not exist in {table_name} where {where_clause}")
+            self._log("Row does not exist in %s where %s", table_name, where_clause)
         else:
             BuiltIn().fail(f"Row found in {table_name} where {where_clause}")
 
     @keyword
-    def table_row_count_should_be(self, table_name, expected_count, where_clause=None):
+    def table_row_count_should_be(
+        self, table_name, expected_count, where_clause=None, *params
+    ):
         """Verify row count in table
 
         Args:
             table_name: Name of the table
             expected_count: Expected number of rows
             where_clause: Optional WHERE clause
+            *params: Values bound to %s placeholders in where_clause
+        """
+        if where_clause:
+            query = f"SELECT COUNT(*) as count FROM {table_name} WHERE {where_clause}"
+        else:
+            query = f"SELECT COUNT(*) as count FROM {table_name}"
+
+        result = self.execute_query(query, *params)
+        actual_count = result[0]["count"] if result else 0
+
+        if actual_count == int(expected_count):
+            self._log("Row count %s matches expected %s", actual_count, expected_count)
+        else:
+            BuiltIn().fail(f"Expected {expected_count} rows, but found {actual_count}")
+
+    @keyword
+    def table_row_column_value_should_be(
+        self, table_name, where_clause, column_name, expected_value, *params
+    ):
+        """Verify specific column value in a row
+
+        Args:
+            table_name: Name of the table
+            where_clause: WHERE clause to identify the row
+            column_name: Name of the column to check
+            expected_value: Expected value
+            *params: Values bound to %s placeholders in where_clause
+        """
+        query = f"SELECT {column_name} FROM {table_name} WHERE {where_clause}"
+        result = self.execute_query(query, *params)
+
+        if not result:
+            BuiltIn().fail(f"No row found in {table_name} where {where_clause}")
+
+        actual_value = result[0][column_name]
+        if str(actual_value) == str(expected_value):
+            self._log("Column %s = %s", column_name, expected_value)
+        else:
+            BuiltIn().fail(
+                f"Expected {column_name} = {expected_value}, but got {actual_value}"
+            )
+
+    @keyword
+    def install_change_notification_trigger(self, table_name, channel=None):
+        """Make a table NOTIFY on every INSERT, UPDATE or DELETE, for the Wait Until keywords
+
+        Installs a statement-level trigger calling pg_notify. Without it the
+        Wait Until keywords poll the table instead.
+
+        Args:
+            table_name: Name of the table
+            channel: Notification channel (default: rf_<table_name>_changes)
+        """
+        identifier = re.sub(r"\W", "_", table_name)
+        channel = channel or f"rf_{identifier}_changes"
+        function_name = f"rf_notify_{identifier}"
+        try:
+            self._execute_unprepared(
+                f"CREATE OR REPLACE FUNCTION {function_name}() RETURNS trigger AS $$ "
+                f"BEGIN PERFORM pg_notify('{channel}', TG_OP); RETURN NULL; END; "
+                f"$$ LANGUAGE plpgsql"
+            )
+            self._execute_unprepared(f"DROP TRIGGER IF EXISTS {function_name} ON {table_name}")
+            self._execute_unprepared(
+                f"CREATE TRIGGER {function_name} AFTER INSERT OR UPDATE OR DELETE "
+                f"ON {table_name} FOR EACH STATEMENT EXECUTE FUNCTION {function_name}()"
+            )
+            self._commit()
+        except Exception as e:
+            self._rollback()
+            BuiltIn().fail(f"Failed to install notification trigger on {table_name}: {str(e)}")
+        self.notification_channels[table_name] = channel
+        self._log("Changes to %s are notified on channel %s", table_name, channel)
+
+    @keyword
+    def remove_change_notification_trigger(self, table_name):
+        """Drop the trigger installed by Install Change Notification Trigger"""
+        identifier = re.sub(r"\W", "_", table_name)
+        function_name = f"rf_notify_{identifier}"
+        try:
+            self._execute_unprepared(f"DROP TRIGGER IF EXISTS {function_name} ON {table_name}")
+            self._execute_unprepared(f"DROP FUNCTION IF EXISTS {function_name}()")
+            self._commit()
+        except Exception as e:
+            self._rollback()
+            BuiltIn().fail(f"Failed to remove notification trigger from {table_name}: {str(e)}")
+        self.notification_channels.pop(table_name, None)
+        if not self.notification_channels and self.listen_connection:
+            self.listen_connection.close()
+            self.listen_connection = None
+            self.listened_channels = set()
+
+    @keyword
+    def wait_until_row_exists(
+        self, table_name, where_clause, *params, timeout=30, poll_interval=0.05,
+        max_poll_interval=2,
+    ):
+        """Wait until a row matching where_clause exists in the table
+
+        Returns as soon as a change notification shows the row has landed when the
+        table has a notification trigger, otherwise polls with exponential backoff
+        from poll_interval up to max_poll_interval.
+
+        Args:
+            table_name: Name of the table
+            where_clause: WHERE clause conditions, with %s placeholders for params
+            *params: Values bound to %s placeholders in where_clause
+            timeout: Seconds to wait before failing (default: 30)
+            poll_interval: First polling interval in seconds (default: 0.05)
+            max_poll_interval: Longest polling interval, also the re-check interval
+                while listening for notifications (default: 2)
+
+        Returns:
+            Seconds waited
         """
-        if where_clause:
-            query = f"SELECT COUNT(*) as count FROM {table_name} WHERE {where_clause}"
-        else:
-            query = f"SELECT COUNT(*) as count FROM {table_name}"
+        query = f"SELECT 1 FROM {table_name} WHERE {where_clause} LIMIT 1"
 
-        result = self.execute_query(query)
-        actual_count = result[0]["count"] if result else 0
+        def row_exists():
+            self._execute(query, params)
+            return self.cursor.fetchone() is not None
 
-        if actual_count == int(expected_count):
-            BuiltIn().log(f"Row count {actual_count} matches expected {expected_count}")
-        else:
-            BuiltIn().fail(f"Expected {expected_count} rows, but found {actual_count}")
+        waited = self._wait_for_change(
+            table_name, row_exists, timeout, poll_interval, max_poll_interval
+        )
+        if waited is None:
+            BuiltIn().fail(f"No row found in {table_name} where {where_clause} within {timeout}s")
+        self._log("Row found in %s where %s after %.3fs", table_name, where_clause, waited)
+        return waited
 
     @keyword
-    def table_row_column_value_should_be(
-        self, table_name, where_clause, column_name, expected_value
+    def wait_until_column_value_is(
+        self, table_name, where_clause, column_name, expected_value, *params, timeout=30,
+        poll_interval=0.05, max_poll_interval=2,
     ):
-        """Verify specific column value in a row
+        """Wait until a column of the row matching where_clause has the expected value
+
+        Uses change notifications or backoff polling like Wait Until Row Exists.
 
         Args:
             table_name: Name of the table
-            where_clause: WHERE clause to identify the row
+            where_clause: WHERE clause to identify the row, with %s placeholders for params
             column_name: Name of the column to check
-            expected_value: Expected value
+            expected_value: Expected value (compared as strings)
+            *params: Values bound to %s placeholders in where_clause
+            timeout: Seconds to wait before failing (default: 30)
+            poll_interval: First polling interval in seconds (default: 0.05)
+            max_poll_interval: Longest polling interval in seconds (default: 2)
+
+        Returns:
+            Seconds waited
         """
-        query = f"SELECT {column_name} FROM {table_name} WHERE {where_clause}"
-        result = self.execute_query(query)
+        query = f"SELECT {column_name} FROM {table_name} WHERE {where_clause} LIMIT 1"
+        last_value = []
 
-        if not result:
-            BuiltIn().fail(f"No row found in {table_name} where {where_clause}")
+        def value_matches():
+            self._execute(query, params)
+            row = self.cursor.fetchone()
+            last_value[:] = [row[column_name] if row else None]
+            return row is not None and str(row[column_name]) == str(expected_value)
 
-        actual_value = result[0][column_name]
-        if str(actual_value) == str(expected_value):
-            BuiltIn().log(f"Column {column_name} = {expected_value}")
-        else:
+        waited = self._wait_for_change(
+            table_name, value_matches, timeout, poll_interval, max_poll_interval
+        )
+        if waited is None:
             BuiltIn().fail(
-                f"Expected {column_name} = {expected_value}, but got {actual_value}"
+                f"Expected {column_name} = {expected_value} in {table_name} where "
+                f"{where_clause} within {timeout}s, last value was {last_value[0]}"
             )
+        self._log("Column %s = %s after %.3fs", column_name, expected_value, waited)
+        return waited
 
     @keyword
     def get_table_row_by_id(self, table_name, id_column, id_value):
@@ -205,8 +1414,8 @@ class DatabaseKeywords:
         Returns:
             Row data as dictionary
         """
-        query = f"SELECT * FROM {table_name} WHERE {id_column} = {id_value}"
-        result = self.execute_query(query)
+        query = f"SELECT * FROM {table_name} WHERE {id_column} = %s"
+        result = self.execute_query(query, id_value)
 
         if not result:
             BuiltIn().fail(
@@ -228,12 +1437,13 @@ class DatabaseKeywords:
         return dict(self.last_query_result[0])
 
     @keyword
-    def delete_table_data(self, table_name, where_clause=None):
+    def delete_table_data(self, table_name, where_clause=None, *params):
         """Delete rows from table
 
         Args:
             table_name: Name of the table
             where_clause: Optional WHERE clause (if not provided, all rows will be deleted)
+            *params: Values bound to %s placeholders in where_clause
 
         Returns:
             Number of rows deleted
@@ -241,10 +1451,10 @@ class DatabaseKeywords:
         if where_clause:
             query = f"DELETE FROM {table_name} WHERE {where_clause}"
         else:
-            BuiltIn().log("WARNING: Deleting all rows from table without WHERE clause")
+            self._log("WARNING: Deleting all rows from table without WHERE clause")
             query = f"DELETE FROM {table_name}"
 
-        return self.execute_update(query)
+        return self.execute_update(query, *params)
 
     @keyword
     def truncate_table(self, table_name):
@@ -255,13 +1465,235 @@ class DatabaseKeywords:
         """
         try:
             query = f"TRUNCATE TABLE {table_name} CASCADE"
-            self.cursor.execute(query)
-            self.connection.commit()
-            BuiltIn().log(f"Table {table_name} truncated")
+            self._execute_unprepared(query)
+            self._commit()
+            self._log("Table %s truncated", table_name)
         except Exception as e:
-            self.connection.rollback()
+            self._rollback()
             BuiltIn().fail(f"Failed to truncate table: {str(e)}")
 
+    @keyword
+    def seed_table_from_rows(
+        self, table_name, rows, column_mapping=None, column_types=None, method="copy",
+        batch_size=1000,
+    ):
+        """Bulk load rows into a table with COPY, or batched multi-row INSERTs
+
+        Values are coerced from the column types of the table (e.g. Excel's 1984.0
+        becomes 1984 for an integer column, "Trailers, Deleted Scenes" becomes an
+        array literal for an array column). Row keys that are not mapped and not
+        columns of the table (such as expected_response) are skipped.
+
+        Args:
+            table_name: Name of the table
+            rows: List of dictionaries, e.g. from Read Test Data From Excel
+            column_mapping: Optional dictionary of row key -> table column; when given,
+                only the mapped keys are loaded
+            column_types: Optional dictionary of table column -> int, float, str, bool,
+                json or array, overriding the coercion picked from the table
+            method: copy (default) or insert; copy falls back to insert when the server
+                does not support COPY FROM STDIN
+            batch_size: Rows per COPY chunk or INSERT statement (default: 1000)
+
+        Returns:
+            Number of rows loaded
+        """
+        if not self.connection:
+            BuiltIn().fail("Not connected to database")
+        if method not in ("copy", "insert"):
+            BuiltIn().fail(f"Unknown seed method '{method}', expected copy or insert")
+        if not rows:
+            self._log("No rows to seed into %s", table_name)
+            return 0
+        batch_size = int(batch_size)
+        column_types = column_types or {}
+
+        table_types = self._column_types(table_name)
+        if column_mapping:
+            mapping = list(column_mapping.items())
+        else:
+            mapping = [(key, key) for key in rows[0] if key in table_types]
+            skipped = [key for key in rows[0] if key not in table_types]
+            if skipped:
+                self._log("Columns not in %s, skipped: %s", table_name, skipped)
+        for type_name in column_types.values():
+            if type_name not in COERCIONS:
+                BuiltIn().fail(
+                    f"Unknown column type '{type_name}', expected one of {list(COERCIONS)}"
+                )
+        fields = []
+        for key, column in mapping:
+            if column not in table_types:
+                BuiltIn().fail(f"Column '{column}' not found in table {table_name}")
+            type_name = column_types.get(column) or DATA_TYPE_COERCIONS.get(
+                table_types[column]
+            )
+            fields.append((key, COERCIONS[type_name] if type_name else None))
+        columns = ", ".join(column for _, column in mapping)
+
+        def values(row):
+            result = []
+            for key, coerce in fields:
+                value = row.get(key)
+                if value is not None and coerce is not None:
+                    value = coerce(value)
+                result.append(value)
+            return result
+
+        try:
+            if method == "copy":
+                try:
+                    self._copy_rows(table_name, columns, rows, values, batch_size)
+                except psycopg2.errors.FeatureNotSupported as e:
+                    self._rollback()
+                    self._log("COPY not supported (%s), using INSERT", e, level="WARN")
+                    method = "insert"
+            if method == "insert":
+                query = f"INSERT INTO {table_name} ({columns}) VALUES %s"
+                started = time.perf_counter()
+                execute_values(
+                    self.cursor, query, [values(row) for row in rows], page_size=batch_size
+                )
+                self._record_statement_time(
+                    query, (), time.perf_counter() - started, explain=False
+                )
+            self._commit()
+        except Exception as e:
+            self._rollback()
+            BuiltIn().fail(f"Failed to seed table {table_name}: {str(e)}")
+        self._log("Seeded %s rows into %s using %s", len(rows), table_name, method)
+        return len(rows)
+
+    @keyword
+    def seed_table_from_excel(
+        self, table_name, file_path, sheet_name, column_mapping=None, column_types=None,
+        method="copy", batch_size=1000,
+    ):
+        """Bulk load a sheet into a table; see Seed Table From Rows
+
+        The sheet is read with UtilityKeywords' Read Test Data From Excel, so it
+        also becomes UtilityKeywords' current test data.
+
+        Args:
+            table_name: Name of the table
+            file_path: Path to Excel file
+            sheet_name: Name of the sheet to load
+            column_mapping: Optional dictionary of sheet column -> table column
+            column_types: Optional dictionary of table column -> int, float, str, bool, json or array
+            method: copy (default) or insert
+            batch_size: Rows per COPY chunk or INSERT statement (default: 1000)
+
+        Returns:
+            Number of rows loaded
+        """
+        utility = BuiltIn().get_library_instance("UtilityKeywords")
+        rows = utility.read_test_data_from_excel(file_path, sheet_name)
+        return self.seed_table_from_rows(
+            table_name, rows, column_mapping, column_types, method, batch_size
+        )
+
+    @keyword
+    def snapshot_table(self, table_name, snapshot_name=None):
+        """Save the current contents of a table so Restore Table can bring them back
+
+        The copy is an UNLOGGED table (default name <table_name>_snapshot), so
+        taking it skips the write-ahead log.
+
+        Args:
+            table_name: Name of the table
+            snapshot_name: Optional name of the snapshot table
+        """
+        snapshot_name = snapshot_name or f"{table_name}_snapshot"
+        try:
+            self._execute_unprepared(f"DROP TABLE IF EXISTS {snapshot_name}")
+            self._execute_unprepared(
+                f"CREATE UNLOGGED TABLE {snapshot_name} AS SELECT * FROM {table_name}"
+            )
+            self._commit()
+        except Exception as e:
+            self._rollback()
+            BuiltIn().fail(f"Failed to snapshot table {table_name}: {str(e)}")
+        self.table_snapshots[table_name] = snapshot_name
+        self._log("Snapshot of %s saved to %s", table_name, snapshot_name)
+
+    @keyword
+    def restore_table(self, table_name, key_column=None):
+        """Restore a table to its last snapshot
+
+        Only rows that were added, changed or deleted since the snapshot are
+        touched: added rows are deleted, and snapshot rows are upserted with
+        INSERT ... ON CONFLICT (key) DO UPDATE where they differ. Unchanged rows
+        keep their identity, so tables referencing them by foreign key are not
+        affected (unlike TRUNCATE).
+
+        Args:
+            table_name: Name of the table
+            key_column: Unique key column(s), comma separated (default: the primary key)
+
+        Returns:
+            Number of rows written back from the snapshot
+        """
+        snapshot_name = self.table_snapshots.get(table_name)
+        if snapshot_name is None:
+            BuiltIn().fail(f"No snapshot taken of table {table_name}")
+        if key_column:
+            keys = [column.strip() for column in key_column.split(",")]
+        else:
+            try:
+                keys = self._primary_key_columns(table_name)
+            except Exception as e:
+                self._rollback()
+                BuiltIn().fail(f"Failed to look up the primary key of {table_name}: {str(e)}")
+        if not keys:
+            BuiltIn().fail(f"Table {table_name} has no primary key, pass key_column")
+        try:
+            self._execute_unprepared(f"SELECT * FROM {snapshot_name} LIMIT 0")
+            columns = [column[0] for column in self.cursor.description]
+            key_list = ", ".join(keys)
+            key_match = " AND ".join(f"s.{key} = t.{key}" for key in keys)
+
+            self._execute_unprepared(
+                f"DELETE FROM {table_name} t WHERE NOT EXISTS "
+                f"(SELECT 1 FROM {snapshot_name} s WHERE {key_match})"
+            )
+            deleted = self.cursor.rowcount
+            updates = [column for column in columns if column not in keys]
+            if updates:
+                # Compared as text, so columns without an equality operator (json) work too
+                conflict = (
+                    "DO UPDATE SET "
+                    + ", ".join(f"{column} = EXCLUDED.{column}" for column in updates)
+                    + " WHERE t::text IS DISTINCT FROM EXCLUDED::text"
+                )
+            else:
+                conflict = "DO NOTHING"
+            self._execute_unprepared(
+                f"INSERT INTO {table_name} AS t ({', '.join(columns)}) "
+                f"SELECT {', '.join(columns)} FROM {snapshot_name} "
+                f"ON CONFLICT ({key_list}) {conflict}"
+            )
+            restored = self.cursor.rowcount
+            self._commit()
+        except Exception as e:
+            self._rollback()
+            BuiltIn().fail(f"Failed to restore table {table_name}: {str(e)}")
+        self._log("Removed %s rows added to %s since the snapshot", deleted, table_name)
+        self._log("Restored %s rows of %s from %s", restored, table_name, snapshot_name)
+        return restored
+
+    @keyword
+    def drop_table_snapshot(self, table_name):
+        """Drop the snapshot taken of a table"""
+        snapshot_name = self.table_snapshots.pop(table_name, None)
+        if snapshot_name is None:
+            return
+        try:
+            self._execute_unprepared(f"DROP TABLE IF EXISTS {snapshot_name}")
+            self._commit()
+        except Exception as e:
+            self._rollback()
+            BuiltIn().fail(f"Failed to drop snapshot {snapshot_name}: {str(e)}")
+
     @keyword
     def verify_record_change(
         self, table_name, id_column, id_value, column_name, old_value, new_value
@@ -280,8 +1712,9 @@ class DatabaseKeywords:
         current_value = row[column_name]
 
         if str(current_value) == str(new_value):
-            BuiltIn().log(
-                f"Record {id_column}={id_value} updated: {column_name} changed from {old_value} to {new_value}"
+            self._log(
+                "Record %s=%s updated: %s changed from %s to %s",
+                id_column, id_value, column_name, old_value, new_value,
             )
         else:
             BuiltIn().fail(
@@ -297,13 +1730,11 @@ class DatabaseKeywords:
             id_column: Name of the ID column
             id_value: Value of the ID
         """
-        query = (
-            f"SELECT COUNT(*) as count FROM {table_name} WHERE {id_column} = {id_value}"
-        )
-        result = self.execute_query(query)
+        query = f"SELECT COUNT(*) as count FROM {table_name} WHERE {id_column} = %s"
+        result = self.execute_query(query, id_value)
 
         if result and result[0]["count"] > 0:
-            BuiltIn().log(f"Record created in {table_name} with {id_column}={id_value}")
+            self._log("Record created in %s with %s=%s", table_name, id_column, id_value)
         else:
             BuiltIn().fail(
                 f"Record not found in {table_name} with {id_column}={id_value}"
@@ -318,14 +1749,12 @@ class DatabaseKeywords:
             id_column: Name of the ID column
             id_value: Value of the ID
         """
-        query = (
-            f"SELECT COUNT(*) as count FROM {table_name} WHERE {id_column} = {id_value}"
-        )
-        result = self.execute_query(query)
+        query = f"SELECT COUNT(*) as count FROM {table_name} WHERE {id_column} = %s"
+        result = self.execute_query(query, id_value)
 
         if result and result[0]["count"] == 0:
-            BuiltIn().log(
-                f"Record deleted from {table_name} with {id_column}={id_value}"
+            self._log(
+                "Record deleted from %s with %s=%s", table_name, id_column, id_value
             )
         else:
             BuiltIn().fail(
@@ -334,25 +1763,498 @@ class DatabaseKeywords:
 
     @keyword
     def verify_table_row_matches_expected_data(
-        self, table_name, where_clause, expected_data
+        self, table_name, where_clause, expected_data, *params
     ):
         """Verify that all key-value pairs in expected_data match the database record
 
         Args:
             table_name: Name of the table
-            where_clause: WHERE clause to identify the row (e.g., 'film_id = 1001')
+            where_clause: WHERE clause to identify the row (e.g., 'film_id = 1001' or 'film_id = %s')
             expected_data: Dictionary with expected column-value pairs
+            *params: Values bound to %s placeholders in where_clause
         """
         query = f"SELECT * FROM {table_name} WHERE {where_clause}"
-        result = self.execute_query(query)
+        result = self.execute_query(query, *params)
 
         if not result:
             BuiltIn().fail(f"No row found in {table_name} where {where_clause}")
 
-        actual_row = dict(result[0])
+        mismatches = self._row_mismatches(dict(result[0]), expected_data)
+
+        if mismatches:
+            error_msg = (
+                f"Database validation failed for {table_name} where {where_clause}:\n"
+            )
+            error_msg += "\n".join(mismatches)
+            BuiltIn().fail(error_msg)
+        else:
+            self._log(
+                "All %s expected values match in %s where %s",
+                len(expected_data), table_name, where_clause,
+            )
+
+    @keyword
+    def verify_records_created(self, table_name, id_column, id_values):
+        """Verify that every record in a list of IDs exists, using a single query
+
+        Args:
+            table_name: Name of the table
+            id_column: Name of the ID column
+            id_values: List of ID values
+
+        Returns:
+            Number of records verified
+        """
+        missing = self._missing_ids(table_name, id_column, id_values)
+        if missing:
+            BuiltIn().fail(
+                f"{len(missing)} of {len(id_values)} records not found in {table_name}: "
+                f"{id_column} in {missing}"
+            )
+        self._log(
+            "All %s records created in %s (%s)", len(id_values), table_name, id_column
+        )
+        return len(id_values)
+
+    @keyword
+    def verify_records_deleted(self, table_name, id_column, id_values):
+        """Verify that no record in a list of IDs exists, using a single query
+
+        Args:
+            table_name: Name of the table
+            id_column: Name of the ID column
+            id_values: List of ID values
+
+        Returns:
+            Number of records verified
+        """
+        missing = set(map(str, self._missing_ids(table_name, id_column, id_values)))
+        remaining = [value for value in id_values if str(value) not in missing]
+        if remaining:
+            BuiltIn().fail(
+                f"{len(remaining)} of {len(id_values)} records still exist in {table_name}: "
+                f"{id_column} in {remaining}"
+            )
+        self._log(
+            "All %s records deleted from %s (%s)", len(id_values), table_name, id_column
+        )
+        return len(id_values)
+
+    @keyword
+    def start_verification_workers(
+        self, db_host, db_name, db_user, db_password, db_port=5432, workers=2, batch_size=100
+    ):
+        """Start background workers that run queued row verifications on their own connections
+
+        Tests enqueue checks with Enqueue Row Verification and carry on; each
+        worker takes up to batch_size queued checks at a time and verifies them
+        with one query per table. Wait For Verifications reports the results.
+        Workers left running by an earlier test that never waited for them are
+        stopped and replaced; their pending checks and results are discarded.
+
+        Args:
+            db_host: Database hostname/IP
+            db_name: Database name
+            db_user: Database user
+            db_password: Database password
+            db_port: Database port (default: 5432)
+            workers: Number of worker threads/connections (default: 2)
+            batch_size: Most checks verified by one query (default: 100)
+        """
+        if self.verification_workers:
+            discarded = self._stop_verification_workers()
+            self._log(
+                "Replaced verification workers that were still running, "
+                "discarding %s pending verifications", discarded, level="WARN"
+            )
+        connect_kwargs = {
+            "host": db_host,
+            "database": db_name,
+            "user": db_user,
+            "password": db_password,
+            "port": int(db_port),
+        }
+        connections = []
+        try:
+            for _ in range(int(workers)):
+                connection = psycopg2.connect(**connect_kwargs)
+                connection.autocommit = True
+                connections.append(connection)
+        except Exception as e:
+            for connection in connections:
+                connection.close()
+            BuiltIn().fail(f"Failed to connect verification workers: {str(e)}")
+
+        with self.verification_lock:
+            self.verification_queue = queue.Queue()
+            self.verification_mismatches = []
+            self.verified_count = 0
+        self.verification_connections = connections
+        self.verification_workers = [
+            threading.Thread(
+                target=self._verification_worker,
+                args=(connection, self.verification_queue, int(batch_size)),
+                name=f"db-verification-{index}",
+                daemon=True,
+            )
+            for index, connection in enumerate(connections)
+        ]
+        for worker in self.verification_workers:
+            worker.start()
+        self._log("Started %s verification workers", len(connections))
+
+    @keyword
+    def enqueue_row_verification(self, table_name, id_column, id_value, expected_data=None):
+        """Queue a check that a row exists and, optionally, matches expected data
+
+        Args:
+            table_name: Name of the table
+            id_column: Name of the ID column
+            id_value: Value of the ID
+            expected_data: Optional dictionary with expected column-value pairs
+        """
+        if not self.verification_workers:
+            BuiltIn().fail("Start Verification Workers before enqueuing verifications")
+        self.verification_queue.put(
+            (table_name, id_column, id_value, dict(expected_data or {}))
+        )
+
+    @keyword
+    def wait_for_verifications(self):
+        """Wait for all queued verifications, stop the workers and fail with every mismatch
+
+        Returns:
+            Number of rows verified
+        """
+        if not self.verification_workers:
+            BuiltIn().fail("No verification workers are running")
+        for _ in self.verification_workers:
+            self.verification_queue.put(None)
+        for worker in self.verification_workers:
+            worker.join()
+        self.verification_workers = []
+        self.verification_connections = []
+        self.verification_queue = None
+
+        with self.verification_lock:
+            mismatches = self.verification_mismatches
+            verified = self.verified_count
+            self.verification_mismatches = []
+            self.verified_count = 0
+        if mismatches:
+            error_msg = f"{len(mismatches)} database verification failures in {verified} rows:\n"
+            error_msg += "\n".join(mismatches)
+            BuiltIn().fail(error_msg)
+        self._log("All %s queued verifications passed", verified)
+        return verified
+
+    @keyword
+    def verify_table_rows_match_expected_data(self, table_name, id_column, expected_rows):
+        """Verify many rows against expected data with one query and one aggregated report
+
+        Every row and column is checked; the keyword fails at the end listing all
+        missing rows and mismatching columns instead of stopping at the first one.
+
+        Args:
+            table_name: Name of the table
+            id_column: Name of the ID column
+            expected_rows: List of dictionaries that each contain id_column, or a
+                dictionary mapping ID values to dictionaries of expected column-value pairs
+
+        Returns:
+            Number of rows verified
+        """
+        if isinstance(expected_rows, dict):
+            expected_by_id = {
+                str(id_value): expected_data
+                for id_value, expected_data in expected_rows.items()
+            }
+        else:
+            expected_by_id = {}
+            for expected_data in expected_rows:
+                if id_column not in expected_data:
+                    BuiltIn().fail(f"Expected row has no '{id_column}': {expected_data}")
+                expected_by_id[str(expected_data[id_column])] = expected_data
+
+        actual_by_id = {
+            str(row[id_column]): dict(row)
+            for row in self._select_by_ids(table_name, id_column, list(expected_by_id))
+        }
+
+        report = []
+        failed_rows = 0
+        for id_value, expected_data in expected_by_id.items():
+            actual_row = actual_by_id.get(id_value)
+            if actual_row is None:
+                mismatches = ["Row not found"]
+            else:
+                mismatches = self._row_mismatches(actual_row, expected_data)
+            if mismatches:
+                failed_rows += 1
+                report.extend(
+                    f"{id_column}={id_value}: {mismatch}" for mismatch in mismatches
+                )
+
+        if report:
+            error_msg = (
+                f"Database validation failed for {failed_rows} of {len(expected_by_id)} "
+                f"rows in {table_name}:\n"
+            )
+            error_msg += "\n".join(report)
+            BuiltIn().fail(error_msg)
+        self._log(
+            "All %s rows match expected data in %s", len(expected_by_id), table_name
+        )
+        return len(expected_by_id)
+
+    def _wait_for_change(self, table_name, condition, timeout, poll_interval, max_poll_interval):
+        """Evaluate condition until it holds, woken by table notifications or backoff polling
+
+        Returns:
+            Seconds waited, or None when the timeout expired
+        """
+        if not self.connection:
+            BuiltIn().fail("Not connected to database")
+        started = time.monotonic()
+        deadline = started + float(timeout)
+        interval = float(poll_interval)
+        max_poll_interval = float(max_poll_interval)
+        channel = self.notification_channels.get(table_name)
+        listener = self._listen(channel) if channel else None
+
+        try:
+            while True:
+                if condition():
+                    return time.monotonic() - started
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                if listener is None:
+                    time.sleep(min(interval, remaining))
+                    interval = min(interval * 2, max_poll_interval)
+                    continue
+                # Sleep until the table changes; re-check every max_poll_interval regardless
+                if select.select([listener], [], [], min(max_poll_interval, remaining))[0]:
+                    listener.poll()
+                    listener.notifies.clear()
+        except psycopg2.Error as e:
+            self._rollback()
+            BuiltIn().fail(f"Waiting on {table_name} failed: {str(e)}")
+
+    def _listen(self, channel):
+        """Return the autocommit connection LISTENing on channel, opening it if needed"""
+        if self.listen_connection is None or self.listen_connection.closed:
+            self.listen_connection = psycopg2.connect(**self.connect_kwargs)
+            self.listen_connection.autocommit = True
+            self.listened_channels = set()
+        if channel not in self.listened_channels:
+            with self.listen_connection.cursor() as cursor:
+                cursor.execute(f'LISTEN "{channel}"')
+            self.listened_channels.add(channel)
+        # Drop notifications of earlier changes; the first check sees their result
+        self.listen_connection.poll()
+        self.listen_connection.notifies.clear()
+        return self.listen_connection
+
+    def _commit(self):
+        """Commit, unless the changes belong to an isolated test transaction"""
+        if not self.isolation_savepoints:
+            self.connection.commit()
+
+    def _rollback(self):
+        """Undo a failed statement; under test isolation only back to the innermost savepoint"""
+        if self.isolation_savepoints:
+            self.cursor.execute(f"ROLLBACK TO SAVEPOINT {self.isolation_savepoints[-1]}")
+        else:
+            self.connection.rollback()
+
+    def _primary_key_columns(self, table_name):
+        """Primary key columns of a table (optionally schema-qualified), in key order"""
+        query = (
+            "SELECT a.attname FROM pg_index i "
+            "JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey) "
+            "WHERE i.indrelid = %s::regclass AND i.indisprimary "
+            "ORDER BY array_position(i.indkey::int2[], a.attnum)"
+        )
+        self._execute(query, (table_name,))
+        return [row["attname"] for row in self.cursor.fetchall()]
+
+    def _column_types(self, table_name):
+        """Map each column of a table (optionally schema-qualified) to its data_type"""
+        schema, _, table = table_name.rpartition(".")
+        query = (
+            "SELECT column_name, data_type FROM information_schema.columns "
+            "WHERE table_name = %s AND table_schema = COALESCE(%s, current_schema())"
+        )
+        self._execute(query, (table, schema or None))
+        column_types = {row["column_name"]: row["data_type"] for row in self.cursor.fetchall()}
+        if not column_types:
+            BuiltIn().fail(f"Table {table_name} not found")
+        return column_types
+
+    def _copy_rows(self, table_name, columns, rows, values, batch_size):
+        """Stream rows to COPY FROM STDIN in text format, batch_size rows per chunk"""
+
+        def chunks():
+            lines = []
+            for row in rows:
+                lines.append(
+                    "\t".join(
+                        "\\N" if value is None else str(value).translate(_COPY_ESCAPES)
+                        for value in values(row)
+                    )
+                )
+                if len(lines) >= batch_size:
+                    yield "\n".join(lines) + "\n"
+                    lines = []
+            if lines:
+                yield "\n".join(lines) + "\n"
+
+        query = f"COPY {table_name} ({columns}) FROM STDIN"
+        started = time.perf_counter()
+        self.cursor.copy_expert(query, _CopyStream(chunks()))
+        self._record_statement_time(query, (), time.perf_counter() - started)
+
+    def _stop_verification_workers(self, timeout=10):
+        """Stop running verification workers without reporting their results
+
+        Pending checks are dropped; a worker still busy after timeout seconds has
+        its query cancelled and its connection closed.
+
+        Returns:
+            Number of queued verifications that were discarded
+        """
+        work_queue = self.verification_queue
+        workers = self.verification_workers
+        connections = self.verification_connections
+        with self.verification_lock:
+            # Detach the queue first so the old workers' results are no longer recorded
+            self.verification_queue = None
+            self.verification_workers = []
+            self.verification_connections = []
+        discarded = 0
+        while True:
+            try:
+                work_queue.get_nowait()
+            except queue.Empty:
+                break
+            discarded += 1
+        for _ in workers:
+            work_queue.put(None)
+        deadline = time.monotonic() + timeout
+        for worker, connection in zip(workers, connections):
+            worker.join(max(0, deadline - time.monotonic()))
+            if worker.is_alive():
+                try:
+                    connection.cancel()
+                    connection.close()
+                except psycopg2.Error:
+                    pass
+        return discarded
+
+    def _verification_worker(self, connection, work_queue, batch_size):
+        """Run verifications from work_queue in batches until a None sentinel arrives
+
+        Runs in a background thread, so it reports through verification_mismatches
+        instead of calling BuiltIn. Results are dropped once work_queue has been
+        replaced by a new set of workers.
+        """
+        cursor = connection.cursor(cursor_factory=RealDictCursor)
+        try:
+            stopping = False
+            while not stopping:
+                batch = []
+                check = work_queue.get()
+                # Each worker consumes exactly one sentinel, so stop draining at it
+                while check is not None:
+                    batch.append(check)
+                    if len(batch) >= batch_size:
+                        break
+                    try:
+                        check = work_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                else:
+                    stopping = True
+                groups = {}
+                for table_name, id_column, id_value, expected_data in batch:
+                    groups.setdefault((table_name, id_column), []).append(
+                        (id_value, expected_data)
+                    )
+                mismatches = []
+                for (table_name, id_column), checks in groups.items():
+                    mismatches.extend(
+                        self._verify_batch(cursor, table_name, id_column, checks)
+                    )
+                with self.verification_lock:
+                    if work_queue is self.verification_queue:
+                        self.verification_mismatches.extend(mismatches)
+                        self.verified_count += len(batch)
+        finally:
+            connection.close()
+
+    def _verify_batch(self, cursor, table_name, id_column, checks):
+        """Verify (id_value, expected_data) checks of one table with a single query"""
+        query = f"SELECT * FROM {table_name} WHERE {id_column} = ANY(%s)"
+        try:
+            started = time.perf_counter()
+            cursor.execute(query, ([self._id_param(id_value) for id_value, _ in checks],))
+            rows = {str(row[id_column]): dict(row) for row in cursor.fetchall()}
+            self._record_statement_time(query, (), time.perf_counter() - started, background=True)
+        except Exception as e:
+            return [
+                f"{table_name} {id_column}={id_value}: Verification query failed: {str(e).strip()}"
+                for id_value, _ in checks
+            ]
         mismatches = []
+        for id_value, expected_data in checks:
+            actual_row = rows.get(str(id_value))
+            if actual_row is None:
+                mismatches.append(f"{table_name} {id_column}={id_value}: Row not found")
+                continue
+            mismatches.extend(
+                f"{table_name} {id_column}={id_value}: {mismatch}"
+                for mismatch in self._row_mismatches(actual_row, expected_data)
+            )
+        return mismatches
+
+    def _select_by_ids(self, table_name, id_column, id_values, columns="*"):
+        """Fetch the rows of table_name whose id_column is in id_values, in one query"""
+        query = f"SELECT {columns} FROM {table_name} WHERE {id_column} = ANY(%s)"
+        if not self.connection:
+            BuiltIn().fail("Not connected to database")
+        try:
+            self._execute(query, ([self._id_param(v) for v in id_values],))
+            self.last_query_result = self.cursor.fetchall()
+        except Exception as e:
+            self._rollback()
+            BuiltIn().fail(f"Query execution failed: {str(e)}")
+        self._log("Query executed: %s (%s IDs)", query, len(id_values))
+        return self.last_query_result
+
+    def _missing_ids(self, table_name, id_column, id_values):
+        """Return the values of id_values that have no row in table_name"""
+        found = {
+            str(row[id_column])
+            for row in self._select_by_ids(table_name, id_column, id_values, id_column)
+        }
+        return [value for value in id_values if str(value) not in found]
+
+    @staticmethod
+    def _id_param(value):
+        """Bind numeric-looking IDs as integers so they compare against integer columns"""
+        if isinstance(value, str) and value.strip().lstrip("-").isdigit():
+            return int(value)
+        return value
+
+    @staticmethod
+    def _row_mismatches(actual_row, expected_data):
+        """Compare expected column-value pairs against a database row
 
-        # Compare each expected key-value pair
+        Returns:
+            List of mismatch descriptions, empty when the row matches
+        """
+        mismatches = []
         for column, expected_value in expected_data.items():
             if column not in actual_row:
                 mismatches.append(f"Column '{column}' not found in database row")
@@ -365,14 +2267,154 @@ class DatabaseKeywords:
                 mismatches.append(
                     f"Column '{column}': Expected '{expected_value}', but got '{actual_value}'"
                 )
+        return mismatches
 
-        if mismatches:
-            error_msg = (
-                f"Database validation failed for {table_name} where {where_clause}:\n"
-            )
-            error_msg += "\n".join(mismatches)
-            BuiltIn().fail(error_msg)
-        else:
-            BuiltIn().log(
-                f"All {len(expected_data)} expected values match in {table_name} where {where_clause}"
+    def _execute(self, query, params=()):
+        """Execute and time a statement on self.cursor, capturing its plan when slow"""
+        started = time.perf_counter()
+        self._execute_statement(query, params)
+        elapsed = time.perf_counter() - started
+        self._record_statement_time(query, params, elapsed)
+
+    def _execute_unprepared(self, query, params=()):
+        """Execute and time a statement on self.cursor, bypassing prepared statements (DDL etc.)"""
+        started = time.perf_counter()
+        self.cursor.execute(query, params or None)
+        self._record_statement_time(query, params, time.perf_counter() - started)
+
+    def _record_statement_time(self, query, params, elapsed, background=False, explain=True):
+        """Add a statement's duration to its shape's timings
+
+        Args:
+            background: True for statements run on a verification worker's connection;
+                        they are timed but not EXPLAINed or reported as the last statement
+            explain: False when query is not runnable SQL (e.g. an execute_values template)
+        """
+        shape = _statement_shape(query)
+        slow = self.slow_query_threshold is not None and elapsed >= self.slow_query_threshold
+        with self.query_timings_lock:
+            if not background:
+                self.last_statement_time = elapsed
+            stats = self.query_timings.get(shape)
+            if stats is None:
+                if len(self.query_timings) >= STATEMENT_STATS_SIZE:
+                    self.query_timings.popitem(last=False)
+                stats = self.query_timings[shape] = {
+                    "count": 0,
+                    "total": 0.0,
+                    "max": 0.0,
+                    "slow_count": 0,
+                    "slowest_query": None,
+                    "plan": None,
+                }
+            stats["count"] += 1
+            stats["total"] += elapsed
+            if slow:
+                stats["slow_count"] += 1
+            slowest = elapsed > stats["max"]
+            if slowest:
+                stats["max"] = elapsed
+                stats["slowest_query"] = query if not params else f"{query} -- params: {params}"
+        if slow and slowest and explain and not background:
+            plan = self._explain(query, params)
+            with self.query_timings_lock:
+                if stats["max"] == elapsed:
+                    stats["plan"] = plan
+            self._log("Slow query (%.3fs): %s\n%s", elapsed, query, plan, level="WARN")
+
+    def _explain(self, query, params):
+        """Return the plan of a statement, re-running it under ANALYZE only if it is a plain SELECT
+
+        EXPLAIN runs inside a savepoint, so a failure leaves the caller's transaction intact.
+        """
+        words = query.split(None, 1)
+        kind = words[0].upper() if words else ""
+        if kind not in PREPARABLE_STATEMENTS:
+            return None
+        analyze = kind in READ_ONLY_STATEMENTS and not _SELECT_INTO.search(query)
+        options = "(ANALYZE, BUFFERS) " if analyze else ""
+        in_transaction = not self.connection.autocommit
+        with self.connection.cursor() as cursor:
+            if in_transaction:
+                cursor.execute("SAVEPOINT rf_explain")
+            try:
+                cursor.execute(f"EXPLAIN {options}{query}", params or None)
+                plan = "\n".join(row[0] for row in cursor.fetchall())
+            except psycopg2.Error as e:
+                if in_transaction:
+                    cursor.execute("ROLLBACK TO SAVEPOINT rf_explain")
+                plan = f"EXPLAIN failed: {str(e).strip()}"
+            if in_transaction:
+                cursor.execute("RELEASE SAVEPOINT rf_explain")
+        return plan
+
+    def _write_slow_query_report(self, report_file):
+        lines = [
+            f"Slowest statement shapes by total time (top {self.slow_query_top_n}, "
+            f"slow threshold {self.slow_query_threshold}s)",
+            "",
+        ]
+        for rank, entry in enumerate(self.get_query_timings(self.slow_query_top_n), start=1):
+            lines.append(
+                f"{rank}. total {entry['total']:.3f}s  count {entry['count']}  "
+                f"mean {entry['mean']:.4f}s  max {entry['max']:.3f}s  slow {entry['slow_count']}"
             )
+            lines.append(f"   shape:   {entry['shape']}")
+            lines.append(f"   slowest: {entry['slowest_query']}")
+            if entry["plan"]:
+                lines.extend(f"   | {line}" for line in entry["plan"].splitlines())
+            lines.append("")
+        directory = os.path.dirname(os.path.abspath(report_file))
+        os.makedirs(directory, exist_ok=True)
+        with open(report_file, "w", encoding="utf-8") as report:
+            report.write("\n".join(lines))
+
+    def _execute_statement(self, query, params=()):
+        """Execute a statement on self.cursor, via a prepared statement when enabled"""
+        stats = self.statement_stats.pop(query, None) or {
+            "executions": 0,
+            "prepared_executions": 0,
+        }
+        self.statement_stats[query] = stats
+        if len(self.statement_stats) > STATEMENT_STATS_SIZE:
+            self.statement_stats.popitem(last=False)
+        stats["executions"] += 1
+        if params:
+            self._log("Parameters: %s", params, level="DEBUG")
+
+        name = None
+        if self.prepared_statement_settings is not None:
+            cache = self.prepared_caches.get(self.connection)
+            if cache is None:
+                cache = _PreparedStatementCache(**self.prepared_statement_settings)
+                self.prepared_caches[self.connection] = cache
+            name = cache.lookup(self.cursor, query, params)
+        if name is None:
+            self.cursor.execute(query, params or None)
+            return
+        stats["prepared_executions"] += 1
+        try:
+            if params:
+                placeholders = ", ".join(["%s"] * len(params))
+                self.cursor.execute(f"EXECUTE {name} ({placeholders})", params)
+            else:
+                self.cursor.execute(f"EXECUTE {name}")
+        except psycopg2.errors.FeatureNotSupported:
+            # "cached plan must not change result type" after a schema change
+            cache.forget(query)
+            raise
+
+    def _get_connection_pool(self, connect_kwargs):
+        key = (
+            connect_kwargs["host"],
+            connect_kwargs["port"],
+            connect_kwargs["database"],
+            connect_kwargs["user"],
+        )
+        pool = self.connection_pools.get(key)
+        if pool is None or pool.closed or pool.connect_kwargs != connect_kwargs:
+            if pool is not None:
+                pool.close()
+            pool = _ConnectionPool(connect_kwargs, **self.pool_settings)
+            self.connection_pools[key] = pool
+        return pool
@@ -7,20 +7,522 @@ import openpyxl
 import json
 from robot.api.deco import keyword
 from robot.libraries.BuiltIn import BuiltIn
+try:
+    from ._logging import LoggingPolicy, LogSamplingListener
+except ImportError:
+    from _logging import LoggingPolicy, LogSamplingListener
+try:
+    from ._serialization import dump_json
+except ImportError:
+    from _serialization import dump_json
+import argparse
+import copy
+import functools
+import glob
+import hashlib
+import math
+import mmap
 import os
+import re
+import struct
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+from datetime import date, datetime, time, timedelta
+from itertools import islice
+from xml.sax.saxutils import escape
+
+# Parsed sheets shared by every library instance in the process,
+# keyed by (absolute path, mtime, size, sheet name)
+_SHEET_CACHE = {}
+_SHEET_CACHE_LOCK = threading.Lock()
+
+# Compiled sheets are stored in this directory next to their workbook
+SIDECAR_DIR = '.sheet_cache'
+SIDECAR_MAGIC = b'RFXS\x02'
+
+# Parsed expected_response cells and compiled expectation matchers kept in LRU caches
+EXPECTATION_CACHE_SIZE = 1024
+_NOT_JSON = object()
+
+
+def _read_sheets(file_path, sheet_names, use_sidecars=True):
+    """Return {sheet name: (headers, rows)} for the requested sheets
+
+    Sheets already parsed from the same unchanged file come from the cache,
+    then from compiled sidecar files; the others are parsed together in one
+    read-only pass over the workbook and compiled for the next run.
+    """
+    path = os.path.abspath(file_path)
+    stat = os.stat(path)
+    keys = {name: (path, stat.st_mtime_ns, stat.st_size, name) for name in sheet_names}
+    with _SHEET_CACHE_LOCK:
+        sheets = {name: _SHEET_CACHE[key] for name, key in keys.items() if key in _SHEET_CACHE}
+    missing = [name for name in sheet_names if name not in sheets]
+    if not missing:
+        return sheets
+
+    source = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'sha256': None}
+    if use_sidecars:
+        for name in missing:
+            sheet = _read_sidecar(path, name, source)
+            if sheet is not None:
+                sheets[name] = sheet
+        parsed = [name for name in missing if name not in sheets]
+    else:
+        parsed = missing
+
+    if parsed:
+        sheets.update(_parse_sheets(path, parsed))
+        if use_sidecars:
+            for name in parsed:
+                _write_sidecar(path, name, source, *sheets[name])
+
+    with _SHEET_CACHE_LOCK:
+        # Entries of older versions of this file can never be hit again
+        for key in [key for key in _SHEET_CACHE if key[0] == path and key[1:3] != (stat.st_mtime_ns, stat.st_size)]:
+            del _SHEET_CACHE[key]
+        for name in missing:
+            _SHEET_CACHE[keys[name]] = sheets[name]
+    return sheets
+
+
+def _parse_sheets(path, sheet_names):
+    """Parse sheets of a workbook in one read-only pass into {sheet name: (headers, rows)}"""
+    sheets = {}
+    workbook = openpyxl.load_workbook(path, read_only=True)
+    try:
+        for name in sheet_names:
+            headers, rows = _sheet_rows(workbook[name])
+            sheets[name] = (headers, list(rows))
+    finally:
+        workbook.close()
+    return sheets
+
+
+def _sheet_rows(worksheet):
+    """Return (headers, lazy iterator of row dictionaries) for a read-only worksheet"""
+    # Trust the cells, not the dimensions recorded in the file
+    worksheet.reset_dimensions()
+    rows = worksheet.iter_rows(values_only=True)
+    headers = next(rows, ())
+    columns = [(index, header) for index, header in enumerate(headers) if header]
+
+    def row_dicts():
+        # Only yield non-empty rows
+        for row in rows:
+            row_data = {header: row[index] if index < len(row) else None for index, header in columns}
+            if any(v is not None for v in row_data.values()):
+                yield row_data
+
+    return [header for _, header in columns], row_dicts()
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _sidecar_path(path, sheet_name):
+    safe_sheet = re.sub(r'[^\w.-]', '_', sheet_name)
+    return os.path.join(os.path.dirname(path), SIDECAR_DIR, f"{os.path.basename(path)}.{safe_sheet}.rfxs")
+
+
+# Sidecar layout: magic, uint32 header length, JSON header, then column sections.
+# Every column has a type: int (int64 values), float (float64 values), str (int64
+# character offsets + one UTF-8 blob) or tagged (str storage of a type tag + text,
+# for dates, durations, booleans and mixed columns), plus an optional one-byte-per-row
+# null mask. Sheets with values of any other type get no sidecar.
+_TAGGED_ENCODERS = (
+    (bool, 'b', lambda value: '1' if value else ''),
+    (int, 'i', str),
+    (float, 'f', repr),
+    (str, 's', str),
+    (datetime, 'd', datetime.isoformat),
+    (date, 'D', date.isoformat),
+    (time, 't', time.isoformat),
+    (timedelta, 'T', lambda value: f"{value.days},{value.seconds},{value.microseconds}"),
+)
+_TAGGED_DECODERS = {
+    'b': bool,
+    'i': int,
+    'f': float,
+    's': str,
+    'd': datetime.fromisoformat,
+    'D': date.fromisoformat,
+    't': time.fromisoformat,
+    'T': lambda text: timedelta(*map(int, text.split(','))),
+}
+
+
+def _column_type(values):
+    types = {type(value) for value in values if value is not None}
+    if types == {int} and all(-2 ** 63 <= value < 2 ** 63 for value in values if value is not None):
+        return 'int'
+    if types and types <= {int, float} and int not in types:
+        return 'float'
+    if types <= {str}:
+        return 'str'
+    return 'tagged'
+
+
+def _encode_tagged(value):
+    for value_type, tag, encode in _TAGGED_ENCODERS:
+        if type(value) is value_type:
+            return tag + encode(value)
+    raise TypeError(f"No sidecar encoding for {type(value).__name__} values")
+
+
+def _encode_strings(values):
+    offsets = array('q', [0])
+    position = 0
+    for value in values:
+        position += len(value)
+        offsets.append(position)
+    return offsets.tobytes() + ''.join(values).encode('utf-8')
+
+
+def _write_sidecar(path, sheet_name, source, headers, rows):
+    """Compile a parsed sheet into its sidecar file; failures only cost the speed-up"""
+    sidecar = _sidecar_path(path, sheet_name)
+    try:
+        if source['sha256'] is None:
+            source['sha256'] = _file_sha256(path)
+        sections = []
+        columns = []
+        for header in headers:
+            values = [row[header] for row in rows]
+            column_type = _column_type(values)
+            nulls = bytes(value is None for value in values)
+            if column_type == 'int':
+                data = array('q', (0 if value is None else value for value in values)).tobytes()
+            elif column_type == 'float':
+                data = array('d', (0.0 if value is None else value for value in values)).tobytes()
+            elif column_type == 'str':
+                data = _encode_strings(['' if value is None else value for value in values])
+            else:
+                data = _encode_strings(['' if value is None else _encode_tagged(value) for value in values])
+            columns.append({'type': column_type, 'length': len(data), 'nulls': any(nulls)})
+            sections.append(data)
+            if any(nulls):
+                sections.append(nulls)
+
+        header = json.dumps({
+            'source': source,
+            'sheet': sheet_name,
+            'byteorder': sys.byteorder,
+            'headers': headers,
+            'rows': len(rows),
+            'columns': columns,
+        }).encode('utf-8')
+        os.makedirs(os.path.dirname(sidecar), exist_ok=True)
+        temporary = f"{sidecar}.{os.getpid()}.tmp"
+        with open(temporary, 'wb') as f:
+            f.write(SIDECAR_MAGIC + struct.pack('<I', len(header)) + header)
+            for section in sections:
+                f.write(section)
+        os.replace(temporary, sidecar)
+    except (OSError, TypeError, ValueError, OverflowError):
+        return None
+    return sidecar
+
+
+def _read_sidecar(path, sheet_name, source):
+    """Load a sheet from its sidecar, or return None if it is missing or stale
+
+    The sidecar is valid when the workbook's mtime and size match, or, after a
+    touch or copy, when its SHA-256 still does.
+    """
+    sidecar = _sidecar_path(path, sheet_name)
+    try:
+        with open(sidecar, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            prefix = len(SIDECAR_MAGIC)
+            if mm[:prefix] != SIDECAR_MAGIC:
+                return None
+            (header_length,) = struct.unpack('<I', mm[prefix:prefix + 4])
+            position = prefix + 4 + header_length
+            header = json.loads(mm[prefix + 4:position])
+            stored = header['source']
+            if (stored['mtime_ns'], stored['size']) != (source['mtime_ns'], source['size']):
+                if source['sha256'] is None:
+                    source['sha256'] = _file_sha256(path)
+                if stored['sha256'] != source['sha256']:
+                    return None
+
+            count = header['rows']
+            swap = header['byteorder'] != sys.byteorder
+            columns = []
+            for column in header['columns']:
+                data = mm[position:position + column['length']]
+                position += column['length']
+                if column['type'] in ('int', 'float'):
+                    values = array('q' if column['type'] == 'int' else 'd')
+                    values.frombytes(data)
+                    if swap:
+                        values.byteswap()
+                    values = values.tolist()
+                else:
+                    offsets = array('q')
+                    offsets.frombytes(data[:(count + 1) * 8])
+                    if swap:
+                        offsets.byteswap()
+                    text = data[(count + 1) * 8:].decode('utf-8')
+                    values = [text[start:end] for start, end in zip(offsets, offsets[1:])]
+                    if column['type'] == 'tagged':
+                        values = [_TAGGED_DECODERS[value[0]](value[1:]) if value else None for value in values]
+                if column['nulls']:
+                    nulls = mm[position:position + count]
+                    position += count
+                    values = [None if null else value for value, null in zip(values, nulls)]
+                columns.append(values)
+    except (OSError, ValueError, KeyError, struct.error):
+        return None
+
+    headers = header['headers']
+    return headers, [dict(zip(headers, values)) for values in zip(*columns)]
+
+
+def _to_int(value):
+    if isinstance(value, str):
+        return int(float(value)) if '.' in value else int(value)
+    return int(value)
+
+
+def _to_bool(value):
+    if isinstance(value, str):
+        return value.strip().lower() in ('true', 'yes', 'y', '1')
+    return bool(value)
+
+
+# Type coercions available to payload templates, by column type name
+COERCIONS = {
+    'int': _to_int,
+    'float': float,
+    'str': str,
+    'bool': _to_bool,
+    'date': lambda value: value.isoformat() if hasattr(value, 'isoformat') else str(value),
+    'json': lambda value: json.loads(value) if isinstance(value, str) else value,
+}
+
+
+class _PayloadTemplate:
+    """Column layout of a sheet compiled into a payload encoder
+
+    Excluded columns are dropped and coercions are resolved once at compile time,
+    so rendering a row is a single pass over the included columns.
+    """
+
+    def __init__(self, columns, exclude_columns, column_types, payload_format, xml_root):
+        excluded = frozenset(exclude_columns)
+        self.fields = tuple(
+            (column, COERCIONS[column_types[column]] if column in column_types else None)
+            for column in columns
+            if column is not None and column not in excluded
+        )
+        self.payload_format = payload_format
+        if payload_format == 'xml':
+            self.xml_prefix = f'<?xml version="1.0" encoding="UTF-8"?>\n<{xml_root}>'
+            self.xml_suffix = f'</{xml_root}>'
+            self.xml_tags = {column: (f'<{column}>', f'</{column}>') for column, _ in self.fields}
+
+    def build(self, row):
+        payload = {}
+        for column, coerce in self.fields:
+            value = row.get(column)
+            if value is not None:
+                payload[column] = coerce(value) if coerce else value
+        return payload
 
-
-class UtilityKeywords:
+    def render(self, row):
+        payload = self.build(row)
+        if self.payload_format == 'xml':
+            parts = [self.xml_prefix]
+            for column, value in payload.items():
+                open_tag, close_tag = self.xml_tags[column]
+                parts.append(f"{open_tag}{escape(str(value))}{close_tag}")
+            parts.append(self.xml_suffix)
+            return ''.join(parts).encode('utf-8')
+        return dump_json(payload)
+
+
+def _to_number(text):
+    """Return a numeric string's value, or None if it is not a finite number"""
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        number = float(text)
+    except ValueError:
+        return None
+    return number if math.isfinite(number) else None
+
+
+def _value_check(expected):
+    """Return check(actual, tolerance) for one expected value
+
+    Numbers (and numeric strings) compare as numbers within the tolerance when the
+    actual value is a number too; everything else falls back to string equality.
+    """
+    text = str(expected)
+    if isinstance(expected, bool) or expected is None or isinstance(expected, (dict, list)):
+        expected_type = type(expected)
+        return lambda actual, tolerance: (type(actual) is expected_type and actual == expected) or str(actual) == text
+
+    number = expected if isinstance(expected, (int, float)) else None
+    if isinstance(expected, str):
+        number = _to_number(expected.strip())
+    if number is None:
+        return lambda actual, tolerance: actual == expected or str(actual) == text
+
+    def check(actual, tolerance):
+        if isinstance(actual, (int, float)) and not isinstance(actual, bool):
+            return abs(actual - number) <= tolerance
+        return str(actual) == text
+    return check
+
+
+class _ExpectationMatcher:
+    """Expected response compiled into one check per key
+
+    Shared by every row with the same expectation, so verifying a response only
+    runs the pre-resolved checks; error details are built only on failure.
+    """
+
+    def __init__(self, expected):
+        self.keys = tuple(expected)
+        self.checks = tuple((key, expected[key], _value_check(expected[key])) for key in self.keys)
+
+    def mismatches(self, actual, tolerance=0):
+        """Return (missing keys, [(key, expected, actual)] for mismatched values)"""
+        missing = [key for key in self.keys if key not in actual]
+        mismatched = [
+            (key, expected, actual[key])
+            for key, expected, check in self.checks
+            if key in actual and not check(actual[key], tolerance)
+        ]
+        return missing, mismatched
+
+
+@functools.lru_cache(maxsize=EXPECTATION_CACHE_SIZE)
+def _parse_expected_response(text):
+    try:
+        return json.loads(text)
+    except ValueError:
+        return _NOT_JSON
+
+
+@functools.lru_cache(maxsize=EXPECTATION_CACHE_SIZE)
+def _compile_expectation_text(text):
+    return _ExpectationMatcher(json.loads(text))
+
+
+_compiled_expectations = OrderedDict()
+_compiled_expectations_lock = threading.Lock()
+
+
+def _expectation_key(value):
+    """Hashable key of an expected value that keeps its types (1, '1', True and (1,) differ)"""
+    if isinstance(value, dict):
+        return dict, tuple((_expectation_key(key), _expectation_key(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return type(value), tuple(_expectation_key(item) for item in value)
+    return type(value), value
+
+
+def _compile_expectation(expected):
+    """Return the matcher for an expected response dict or JSON string, cached by content"""
+    if isinstance(expected, str):
+        return _compile_expectation_text(expected)
+    key = _expectation_key(expected)
+    try:
+        with _compiled_expectations_lock:
+            matcher = _compiled_expectations.get(key)
+            if matcher is not None:
+                _compiled_expectations.move_to_end(key)
+                return matcher
+    except TypeError:
+        # Unhashable values (e.g. sets): compile without caching
+        return _ExpectationMatcher(expected)
+    # Compiled from a copy, so the caller changing expected never changes the cached matcher
+    matcher = _ExpectationMatcher(copy.deepcopy(expected))
+    with _compiled_expectations_lock:
+        _compiled_expectations[key] = matcher
+        if len(_compiled_expectations) > EXPECTATION_CACHE_SIZE:
+            _compiled_expectations.popitem(last=False)
+    return matcher
+
+
+class _SheetStream:
+    """A sheet opened for chunked reading; rows are parsed only as chunks are requested"""
+
+    def __init__(self, file_path, sheet_name, chunk_size):
+        self.sheet_name = sheet_name
+        self.chunk_size = chunk_size
+        self.rows_read = 0
+        self.workbook = openpyxl.load_workbook(file_path, read_only=True)
+        try:
+            self.headers, self.rows = _sheet_rows(self.workbook[sheet_name])
+        except Exception:
+            self.workbook.close()
+            raise
+        self.exhausted = False
+
+    def next_chunk(self, chunk_size=None):
+        if self.exhausted:
+            return []
+        chunk = list(islice(self.rows, chunk_size or self.chunk_size))
+        self.rows_read += len(chunk)
+        if not chunk:
+            # Release the file as soon as the sheet is done
+            self.close()
+        return chunk
+
+    def close(self):
+        if not self.exhausted:
+            self.exhausted = True
+            self.workbook.close()
+
+
+class UtilityKeywords(LoggingPolicy):
     ROBOT_LIBRARY_SCOPE = 'GLOBAL'
 
     def __init__(self):
         self.excel_data = None
+        self.excel_headers = None
         self.current_test_data = None
+        self.data_version = 0
+        self.indexes = {}
+        self.indexes_version = 0
+        self.payload_templates = {}
+        self.use_sidecars = True
+        self.streams = {}
+        self._init_logging_policy()
+        self.ROBOT_LIBRARY_LISTENER = LogSamplingListener(self)
+
+    @keyword
+    def set_utility_logging_policy(self, level='INFO', max_length=None, sample_every=1):
+        """Control how much UtilityKeywords logs
+
+        Args:
+            level: Minimum level logged: TRACE, DEBUG, INFO (default), WARN or NONE
+            max_length: Truncate each logged message to this many characters (default: no limit)
+            sample_every: Inside FOR/WHILE loops, log only 1 in N iterations (default: every iteration)
+        """
+        self._set_logging_policy(level, max_length, sample_every)
 
     @keyword
     def read_test_data_from_excel(self, file_path, sheet_name):
         """Read test data from Excel file
 
+        Sheets are parsed in read-only mode and cached for the whole run until
+        the file changes on disk. Parsed sheets are also compiled into sidecar
+        files (see Set Excel Sidecar Cache) that later runs load instead.
+
         Args:
             file_path: Path to Excel file
             sheet_name: Name of the sheet to read
@@ -32,35 +534,140 @@ class UtilityKeywords:
             BuiltIn().fail(f"Excel file not found: {file_path}")
 
         try:
-            workbook = openpyxl.load_workbook(file_path)
-            worksheet = workbook[sheet_name]
+            headers, rows = _read_sheets(file_path, [sheet_name], self.use_sidecars)[sheet_name]
+        except Exception as e:
+            BuiltIn().fail(f"Failed to read Excel file: {str(e)}")
 
-            # Get headers from first row
-            headers = []
-            for cell in worksheet[1]:
-                headers.append(cell.value)
+        # Copies, so tests changing a row never change the cached sheet
+        test_data = [dict(row) for row in rows]
+        self._set_excel_data(test_data, headers)
+        self._log("Read %s rows from %s", len(test_data), sheet_name)
+        return test_data
 
-            # Get data from remaining rows
-            test_data = []
-            for row_idx, row in enumerate(worksheet.iter_rows(min_row=2, values_only=True), start=2):
-                row_data = {}
-                for col_idx, cell_value in enumerate(row):
-                    if col_idx < len(headers) and headers[col_idx]:
-                        row_data[headers[col_idx]] = cell_value
+    @keyword
+    def read_test_data_from_excel_sheets(self, file_path, *sheet_names):
+        """Read several sheets of an Excel file in a single pass
 
-                # Only add non-empty rows
-                if any(v is not None for v in row_data.values()):
-                    test_data.append(row_data)
+        The first sheet becomes the current test data, as with Read Test Data From Excel.
 
-            self.excel_data = test_data
-            workbook.close()
+        Args:
+            file_path: Path to Excel file
+            *sheet_names: Names of the sheets to read
 
-            BuiltIn().log(f"Read {len(test_data)} rows from {sheet_name}")
-            return test_data
+        Returns:
+            Dictionary mapping each sheet name to its list of test data rows
+        """
+        if not os.path.exists(file_path):
+            BuiltIn().fail(f"Excel file not found: {file_path}")
+        if not sheet_names:
+            BuiltIn().fail("At least one sheet name is required")
 
+        try:
+            sheets = _read_sheets(file_path, sheet_names, self.use_sidecars)
         except Exception as e:
             BuiltIn().fail(f"Failed to read Excel file: {str(e)}")
 
+        test_data = {name: [dict(row) for row in sheets[name][1]] for name in sheet_names}
+        self._set_excel_data(test_data[sheet_names[0]], sheets[sheet_names[0]][0])
+        self._log("Read %s", {name: len(rows) for name, rows in test_data.items()})
+        return test_data
+
+    @keyword
+    def open_test_data_stream(self, file_path, sheet_name, chunk_size=500, stream_name='default'):
+        """Open a sheet for chunked reading instead of loading all of its rows
+
+        Rows are parsed only as chunks are requested, so the first rows of a huge
+        sheet are available immediately and memory stays bounded by the chunk size.
+        The stream does not change the data returned by Get All Test Data.
+
+        Args:
+            file_path: Path to Excel file
+            sheet_name: Name of the sheet to read
+            chunk_size: Default number of rows per chunk
+            stream_name: Name to refer to the stream by, to have several open at once
+
+        Returns:
+            List of the sheet's column headers (e.g. for Compile Payload Template columns=)
+        """
+        if not os.path.exists(file_path):
+            BuiltIn().fail(f"Excel file not found: {file_path}")
+        if stream_name in self.streams:
+            self.streams.pop(stream_name).close()
+
+        try:
+            stream = _SheetStream(file_path, sheet_name, int(chunk_size))
+        except Exception as e:
+            BuiltIn().fail(f"Failed to open Excel sheet: {str(e)}")
+
+        self.streams[stream_name] = stream
+        self._log("Opened stream '%s' on %s", stream_name, sheet_name)
+        return list(stream.headers)
+
+    @keyword
+    def get_next_test_data_chunk(self, stream_name='default', chunk_size=None):
+        """Get the next rows of an open test data stream
+
+        Args:
+            stream_name: Name given to Open Test Data Stream
+            chunk_size: Number of rows (default: the stream's chunk size)
+
+        Returns:
+            List of test data rows; empty once the sheet is exhausted
+        """
+        stream = self._stream(stream_name)
+        chunk = stream.next_chunk(int(chunk_size) if chunk_size else None)
+        self._log("Read %s rows from stream '%s' (%s so far)", len(chunk), stream_name, stream.rows_read)
+        return chunk
+
+    @keyword
+    def get_next_payload_chunk(self, template_name, stream_name='default', chunk_size=None):
+        """Get the next rows of an open test data stream rendered with a payload template
+
+        Args:
+            template_name: Name given to Compile Payload Template
+            stream_name: Name given to Open Test Data Stream
+            chunk_size: Number of rows (default: the stream's chunk size)
+
+        Returns:
+            List of encoded payloads (bytes); empty once the sheet is exhausted
+        """
+        template = self._payload_template(template_name)
+        return [template.render(row) for row in self.get_next_test_data_chunk(stream_name, chunk_size)]
+
+    @keyword
+    def close_test_data_stream(self, stream_name='default'):
+        """Close a test data stream and release its workbook
+
+        Returns:
+            Number of rows read from the stream
+        """
+        stream = self._stream(stream_name)
+        del self.streams[stream_name]
+        stream.close()
+        return stream.rows_read
+
+    @keyword
+    def set_excel_sidecar_cache(self, enabled=True):
+        """Turn compiled sidecar files for Excel sheets on (default) or off
+
+        Each sheet read is compiled into a binary file in a .sheet_cache directory
+        next to its workbook, which later runs memory-map instead of parsing the
+        workbook. A sidecar is ignored once the workbook changes. Sidecars can be
+        built ahead of time with: python keywords/UtilityKeywords.py test_data
+
+        Args:
+            enabled: Whether sidecars are read and written
+        """
+        if isinstance(enabled, str):
+            enabled = enabled.strip().lower() not in ('false', 'no', 'off', '0', 'none', '')
+        self.use_sidecars = bool(enabled)
+
+    @keyword
+    def clear_excel_cache(self):
+        """Drop every cached sheet, forcing the next read to parse the workbook again"""
+        with _SHEET_CACHE_LOCK:
+            _SHEET_CACHE.clear()
+
     @keyword
     def get_test_data_by_name(self, data_name):
         """Get specific test data row by name/identifier
@@ -74,19 +681,65 @@ class UtilityKeywords:
         if not self.excel_data:
             BuiltIn().fail("No Excel data loaded")
 
-        for row in self.excel_data:
-            # Check if 'name' or 'Name' or first column matches
-            if 'name' in row and str(row['name']).lower() == str(data_name).lower():
-                self.current_test_data = row
-                return row
-            elif 'Name' in row and str(row['Name']).lower() == str(data_name).lower():
-                self.current_test_data = row
-                return row
-            elif 'title' in row and str(row['title']).lower() == str(data_name).lower():
-                self.current_test_data = row
-                return row
+        # First row whose 'name', 'Name' or 'title' matches, via one index per column
+        key = (str(data_name).lower(),)
+        positions = [
+            self._index((column,)).get(key, [None])[0]
+            for column in ('name', 'Name', 'title')
+            if column in self.excel_headers
+        ]
+        positions = [position for position in positions if position is not None]
+        if not positions:
+            BuiltIn().fail(f"Test data '{data_name}' not found")
+
+        row = self.excel_data[min(positions)]
+        self.current_test_data = row
+        return row
+
+    @keyword
+    def get_test_data_by_key(self, columns, *values):
+        """Get the first test data row whose key column(s) match the given values
+
+        Matching is case-insensitive and uses a hash index on the column(s), built
+        on first use and kept until other test data is loaded.
+
+        Args:
+            columns: Key column, or comma separated columns of a composite key (e.g. first_name, last_name)
+            *values: One value per key column
+
+        Returns:
+            Test data row as dictionary
+        """
+        rows = self.get_test_data_group_by_key(columns, *values)
+        self.current_test_data = rows[0]
+        return rows[0]
+
+    @keyword
+    def get_test_data_group_by_key(self, columns, *values):
+        """Get all test data rows whose key column(s) match the given values, in sheet order
+
+        Args:
+            columns: Key column, or comma separated columns of a composite key
+            *values: One value per key column
+
+        Returns:
+            List of test data rows
+        """
+        if not self.excel_data:
+            BuiltIn().fail("No Excel data loaded")
+        columns = self._key_columns(columns)
+        if len(values) != len(columns):
+            BuiltIn().fail(f"Expected {len(columns)} key value(s) for {list(columns)}, got {len(values)}")
+
+        positions = self._index(columns).get(tuple(str(value).lower() for value in values))
+        if not positions:
+            BuiltIn().fail(f"No test data with {dict(zip(columns, values))}")
+        return [self.excel_data[position] for position in positions]
 
-        BuiltIn().fail(f"Test data '{data_name}' not found")
+    @keyword
+    def rebuild_test_data_indexes(self):
+        """Drop all test data indexes; use after changing key values in loaded rows"""
+        self.data_version += 1
 
     @keyword
     def get_all_test_data(self):
@@ -113,10 +766,9 @@ class UtilityKeywords:
         if exclude_columns is None:
             exclude_columns = ['expected_response', 'expected_response']
 
-        payload = {}
-        for key, value in test_data_row.items():
-            if key not in exclude_columns and value is not None:
-                payload[key] = value
+        excluded = frozenset(exclude_columns)
+        payload = {key: value for key, value in test_data_row.items()
+                   if key not in excluded and value is not None}
 
         return json.dumps(payload)
 
@@ -134,12 +786,69 @@ class UtilityKeywords:
         if exclude_columns is None:
             exclude_columns = ['expected_response']
 
-        payload = {}
-        for key, value in test_data_row.items():
-            if key not in exclude_columns and value is not None:
-                payload[key] = value
+        excluded = frozenset(exclude_columns)
+        return {key: value for key, value in test_data_row.items()
+                if key not in excluded and value is not None}
 
-        return payload
+    @keyword
+    def compile_payload_template(self, template_name, exclude_columns=None, column_types=None,
+                                 payload_format='json', xml_root='payload', columns=None):
+        """Compile a sheet's column layout into a reusable payload template
+
+        Args:
+            template_name: Name used to render payloads with this template
+            exclude_columns: List of column names to leave out (default: ['expected_response'])
+            column_types: Optional dictionary (or JSON string) of column name to type:
+                          int, float, str, bool, date or json
+            payload_format: 'json' or 'xml'
+            xml_root: Root element name for XML payloads
+            columns: Column names (default: headers of the last sheet read)
+        """
+        payload_format = payload_format.lower()
+        if payload_format not in ('json', 'xml'):
+            BuiltIn().fail(f"Unsupported payload format '{payload_format}', expected json or xml")
+        if columns is None:
+            if not self.excel_headers:
+                BuiltIn().fail("No Excel data loaded and no columns given")
+            columns = self.excel_headers
+        if exclude_columns is None:
+            exclude_columns = ['expected_response']
+        if isinstance(column_types, str):
+            column_types = json.loads(column_types)
+        column_types = column_types or {}
+
+        unknown = {name: kind for name, kind in column_types.items() if kind not in COERCIONS}
+        if unknown:
+            BuiltIn().fail(f"Unknown column types {unknown}, expected one of {list(COERCIONS)}")
+
+        template = _PayloadTemplate(columns, exclude_columns, column_types, payload_format, xml_root)
+        self.payload_templates[template_name] = template
+        self._log("Payload template '%s' compiled: %s columns as %s",
+                  template_name, len(template.fields), payload_format)
+
+    @keyword
+    def render_payload(self, template_name, test_data_row):
+        """Render a test data row into ready-to-send payload bytes
+
+        Args:
+            template_name: Name of a compiled payload template
+            test_data_row: Dictionary of test data
+
+        Returns:
+            Encoded payload (bytes) to pass to Perform POST/PUT Request
+        """
+        return self._payload_template(template_name).render(test_data_row)
+
+    @keyword
+    def render_payloads(self, template_name, test_data_rows=None):
+        """Render many rows (default: all loaded Excel rows) with a payload template
+
+        Returns:
+            List of encoded payloads (bytes), in row order
+        """
+        template = self._payload_template(template_name)
+        rows = test_data_rows if test_data_rows is not None else self.get_all_test_data()
+        return [template.render(row) for row in rows]
 
     @keyword
     def get_expected_response(self, test_data_row):
@@ -156,48 +865,36 @@ class UtilityKeywords:
 
         expected = test_data_row['expected_response']
 
-        # If it's a string that looks like JSON, try to parse it
+        # If it's a string that looks like JSON, try to parse it (once per distinct cell)
         if isinstance(expected, str):
-            try:
-                return json.loads(expected)
-            except:
+            parsed = _parse_expected_response(expected)
+            if parsed is _NOT_JSON:
                 return expected
+            # Deep copy, so tests changing the result (at any depth) never change the cached value
+            return copy.deepcopy(parsed)
 
         return expected
 
     @keyword
-    def should_contain_expected_keys(self, actual_response, expected_response):
+    def should_contain_expected_keys(self, actual_response, expected_response, tolerance=0):
         """Verify that actual response contains all keys and values from expected response
     
             The actual response can have additional fields not in expected response.
             This checks that expected keys exist in actual response AND their values match.
+            Numbers (and numeric strings) match numbers within the tolerance, so 5, 5.0
+            and '5' are equal; other values are compared as strings. The expected response
+            is compiled once and reused for every response with the same expectation.
 
         Args:
             actual_response: Actual response dictionary
             expected_response: Expected response dictionary (can be subset of actual)
+            tolerance: Allowed absolute difference between numeric values
         """
-        if isinstance(expected_response, str):
-            expected_response = json.loads(expected_response)
-    
+        matcher = _compile_expectation(expected_response)
+
         if isinstance(actual_response, str):
             actual_response = json.loads(actual_response)
-        missing_keys = []
-        mismatched_values = []
-    
-        for key in expected_response.keys():
-            if key not in actual_response:
-                missing_keys.append(key)
-            else:
-                expected_value = expected_response[key]
-                actual_value = actual_response[key]
-            
-            # Compare values (convert to string for comparison to handle type differences)
-                if str(actual_value) != str(expected_value):
-                    mismatched_values.append({
-                        'key': key,
-                        'expected': expected_value,
-                        'actual': actual_value
-                    })
+        missing_keys, mismatched_values = matcher.mismatches(actual_response, float(tolerance))
 
         # Build error message if there are issues
         errors = []
@@ -205,15 +902,85 @@ class UtilityKeywords:
             errors.append(f"Missing keys in response: {missing_keys}")
     
         if mismatched_values:
-            mismatch_details = []
-            for mismatch in mismatched_values:
-                mismatch_details.append(
-                    f"  - Key '{mismatch['key']}': expected '{mismatch['expected']}', got '{mismatch['actual']}'"
-                )
+            mismatch_details = [
+                f"  - Key '{key}': expected '{expected}', got '{actual}'"
+                for key, expected, actual in mismatched_values
+            ]
             errors.append("Value mismatches:\n" + "\n".join(mismatch_details))
     
         if errors:
             BuiltIn().fail("\n".join(errors))
 
-        BuiltIn().log(f"All expected keys and values match in actual response")
-        BuiltIn().log(f"Verified {len(expected_response)} fields successfully")
\ No newline at end of file
+        self._log("All expected keys and values match in actual response")
+        self._log("Verified %s fields successfully", len(matcher.keys))
+
+    def _set_excel_data(self, rows, headers):
+        self.excel_data = rows
+        self.excel_headers = list(headers)
+        self.data_version += 1
+
+    def _key_columns(self, columns):
+        if isinstance(columns, str):
+            columns = columns.split(',')
+        columns = tuple(str(column).strip() for column in columns)
+        unknown = [column for column in columns if column not in self.excel_headers]
+        if unknown:
+            BuiltIn().fail(f"Unknown test data column(s) {unknown}, available: {self.excel_headers}")
+        return columns
+
+    def _index(self, columns):
+        """Return {lowercased key tuple: [row positions]} for the loaded data, building it once per data version"""
+        if self.indexes_version != self.data_version:
+            self.indexes = {}
+            self.indexes_version = self.data_version
+        index = self.indexes.get(columns)
+        if index is None:
+            index = {}
+            for position, row in enumerate(self.excel_data):
+                if all(column in row for column in columns):
+                    key = tuple(str(row[column]).lower() for column in columns)
+                    index.setdefault(key, []).append(position)
+            self.indexes[columns] = index
+        return index
+
+    def _stream(self, stream_name):
+        if stream_name not in self.streams:
+            BuiltIn().fail(f"No open test data stream '{stream_name}'")
+        return self.streams[stream_name]
+
+    def _payload_template(self, template_name):
+        if template_name not in self.payload_templates:
+            BuiltIn().fail(f"Payload template '{template_name}' has not been compiled")
+        return self.payload_templates[template_name]
+
+
+def main(argv=None):
+    """Compile the sheets of every workbook in a directory into sidecar files"""
+    parser = argparse.ArgumentParser(
+        description='Precompile Excel test data into sidecar files for UtilityKeywords.'
+    )
+    parser.add_argument('directory', nargs='?', default='test_data', help='Directory containing .xlsx workbooks')
+    parser.add_argument('--recursive', action='store_true', help='Also compile workbooks in subdirectories')
+    args = parser.parse_args(argv)
+
+    pattern = os.path.join(args.directory, '**' if args.recursive else '', '*.xlsx')
+    workbooks = sorted(glob.glob(pattern, recursive=args.recursive))
+    if not workbooks:
+        print(f"No .xlsx workbooks found in {args.directory}")
+        return 1
+    for workbook_path in workbooks:
+        path = os.path.abspath(workbook_path)
+        stat = os.stat(path)
+        source = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'sha256': None}
+        workbook = openpyxl.load_workbook(path, read_only=True)
+        sheet_names = workbook.sheetnames
+        workbook.close()
+        for name, (headers, rows) in _parse_sheets(path, sheet_names).items():
+            sidecar = _write_sidecar(path, name, source, headers, rows)
+            status = sidecar or 'FAILED'
+            print(f"{workbook_path} [{name}]: {len(rows)} rows -> {status}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""
+Logging policy shared by the keyword libraries
+Provides log levels, message truncation and loop sampling.
+"""
+
+from robot.libraries.BuiltIn import BuiltIn
+
+# Log levels understood by the logging policy, lowest first
+LOG_LEVELS = {'TRACE': 0, 'DEBUG': 1, 'INFO': 2, 'WARN': 3, 'NONE': 4}
+
+
+class LogSamplingListener:
+    """Library listener advancing the log sampling counter on every loop iteration"""
+
+    ROBOT_LISTENER_API_VERSION = 3
+
+    def __init__(self, library):
+        self.library = library
+
+    def start_for_iteration(self, data, result):
+        self.library._next_log_sample()
+
+    def start_while_iteration(self, data, result):
+        self.library._next_log_sample()
+
+    def end_for(self, data, result):
+        self.library.log_sampled = True
+
+    def end_while(self, data, result):
+        self.library.log_sampled = True
+
+
+class LoggingPolicy:
+    """Mixin giving a keyword library a logging policy
+
+    The library calls _init_logging_policy() from __init__, registers a
+    LogSamplingListener and exposes _set_logging_policy() through its own keyword.
+    """
+
+    def _init_logging_policy(self):
+        self.log_level = LOG_LEVELS['INFO']
+        self.max_log_length = None
+        self.log_sample_every = 1
+        self.log_counter = 0
+        self.log_sampled = True
+
+    def _set_logging_policy(self, level='INFO', max_length=None, sample_every=1):
+        level = level.upper()
+        if level not in LOG_LEVELS:
+            BuiltIn().fail(f"Unknown log level '{level}', expected one of {list(LOG_LEVELS)}")
+        self.log_level = LOG_LEVELS[level]
+        self.max_log_length = int(max_length) if max_length not in (None, '', 'None') else None
+        self.log_sample_every = max(1, int(sample_every))
+        self.log_counter = 0
+        self.log_sampled = True
+
+    def _log(self, message, *args, level='INFO', console=False):
+        """Log a message if the logging policy allows it
+
+        %-style args are only interpolated once the message is known to be logged.
+        """
+        if LOG_LEVELS[level] < self.log_level or not self.log_sampled:
+            return
+        if args:
+            message = message % args
+        if self.max_log_length and len(message) > self.max_log_length:
+            message = f"{message[:self.max_log_length]}... [truncated {len(message) - self.max_log_length} characters]"
+        BuiltIn().log(message, level, console=console)
+
+    def _next_log_sample(self):
+        """Start a new loop iteration; only every Nth iteration is logged"""
+        self.log_sampled = self.log_counter % self.log_sample_every == 0
+        self.log_counter += 1
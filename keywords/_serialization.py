@@ -0,0 +1,26 @@
+"""
+JSON encoding shared by the keyword libraries
+Produces the same bytes whether or not orjson is installed.
+"""
+
+import json
+from datetime import date, time
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_default(value):
+    """Encode values JSON has no type for: ISO 8601 for dates and times, str() otherwise"""
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    return str(value)
+
+
+def dump_json(value):
+    """Serialize a payload to compact UTF-8 JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(value, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, default=_json_default, separators=(',', ':'), ensure_ascii=False).encode('utf-8')